@@ -1,3 +1,6 @@
+import hashlib
+import json
+from collections import OrderedDict
 import pygame
 from constants import BASE
 
@@ -5,6 +8,10 @@ ASSETS_DIR = BASE / "assets"
 
 CARD_FACES_DIR = ASSETS_DIR/"card_pngs"/"card_faces"
 CARD_BACKS_DIR = ASSETS_DIR/"card_pngs"/"card_backs"
+ATLAS_DIR = ASSETS_DIR/"cache"
+
+CARD_SIZE = (80, 120)
+ATLAS_COLUMNS = 13
 
 def load_image(path, size=None):
     image = pygame.image.load(path).convert_alpha()
@@ -12,11 +19,209 @@ def load_image(path, size=None):
         image = pygame.transform.smoothscale(image, size)
     return image
 
-def load_card_faces():
-    faces = {}
-    for p in CARD_FACES_DIR.glob("*.png"):
-        faces[p.stem] = load_image(p)
-    return faces
+def card_back_paths():
+    return sorted(CARD_BACKS_DIR.glob("*.png"))
+
+
+BACK_KEY = "back"
+
+
+def atlas_sources():
+    """(atlas key, path) for every face and back; backs are keyed back_<index>"""
+    sources = [(p.stem, p) for p in sorted(CARD_FACES_DIR.glob("*.png"))]
+    sources += [(f"{BACK_KEY}_{i}", p) for i, p in enumerate(card_back_paths())]
+    return sources
+
+
+def source_fingerprint(sources):
+    # Name, size and mtime of every source PNG; any edit, add or delete changes it
+    digest = hashlib.sha1()
+    for key, path in sources:
+        stat = path.stat()
+        digest.update(f"{key}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def atlas_paths(size):
+    name = f"cards_{size[0]}x{size[1]}"
+    # Uncompressed BMP: larger on disk than PNG, but decodes several times faster
+    return ATLAS_DIR / f"{name}.bmp", ATLAS_DIR / f"{name}.json"
+
+
+def build_atlas(size=CARD_SIZE):
+    """
+    Scale every face and back to size, pack them into one grid image and save
+    it with a JSON index (key -> rect, plus the source fingerprint) under
+    assets/cache. Works without a display; returns (atlas surface, index).
+    """
+    sources = atlas_sources()
+    width, height = size
+    rows = (len(sources) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    atlas = pygame.Surface((ATLAS_COLUMNS * width, rows * height), pygame.SRCALPHA)
+    rects = {}
+    for i, (key, path) in enumerate(sources):
+        x, y = (i % ATLAS_COLUMNS) * width, (i // ATLAS_COLUMNS) * height
+        image = pygame.transform.smoothscale(pygame.image.load(path), size)
+        atlas.blit(image, (x, y))
+        rects[key] = [x, y, width, height]
+
+    index = {"size": list(size), "fingerprint": source_fingerprint(sources), "rects": rects}
+    image_path, index_path = atlas_paths(size)
+    ATLAS_DIR.mkdir(parents=True, exist_ok=True)
+    pygame.image.save(atlas, str(image_path))
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    return atlas, index
+
+
+def load_atlas(size=CARD_SIZE):
+    """
+    Atlas surface and index for size, rebuilt first when the cached copy is
+    missing or its fingerprint no longer matches the source PNGs.
+    """
+    image_path, index_path = atlas_paths(size)
+    fingerprint = source_fingerprint(atlas_sources())
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get("fingerprint") != fingerprint or not image_path.exists():
+            raise ValueError("stale atlas")
+        atlas = pygame.image.load(image_path)
+    except (OSError, ValueError, pygame.error):
+        print(f"Building card atlas {image_path.name}")
+        atlas, index = build_atlas(size)
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()
+    return atlas, index
+
+
+class CardImages:
+    """
+    Lazy card image store: a face PNG is decoded the first time that face is
+    requested, and only the selected card back is ever loaded.
+
+    scaled() keeps each image smoothscaled once per target size, so drawing
+    a card every frame is a dict lookup instead of a smoothscale call. At
+    CARD_SIZE the images are subsurfaces of the prebuilt atlas instead, so
+    the whole deck costs a single decode; if the atlas can't be loaded or
+    built, the per-file lazy path is used.
+    """
+    def __init__(self, back_index=0, use_atlas=True):
+        self.back_index = back_index
+        self._faces = {}
+        self._back = None
+        self.use_atlas = use_atlas
+        self._atlas = None
+
+        self._scaled = {}
+        self.scaled_hits = 0
+        self.scaled_misses = 0
+
+    def scaled(self, key, size):
+        """Image for key (a face image_key() or BACK_KEY) scaled to size, cached"""
+        cache_key = (key, size)
+        image = self._scaled.get(cache_key)
+        if image is None:
+            self.scaled_misses += 1
+            image = self._from_atlas(key, size)
+            if image is None:
+                source = self.back() if key == BACK_KEY else self.face(key)
+                image = pygame.transform.smoothscale(source, size)
+            self._scaled[cache_key] = image
+        else:
+            self.scaled_hits += 1
+        return image
+
+    def _from_atlas(self, key, size):
+        if not self.use_atlas or size != CARD_SIZE:
+            return None
+        if self._atlas is None:
+            try:
+                self._atlas = load_atlas(size)
+            except (OSError, pygame.error) as e:
+                print(f"Card atlas unavailable, loading cards individually: {e}")
+                self.use_atlas = False
+                return None
+        atlas, index = self._atlas
+        rect = index["rects"].get(f"{BACK_KEY}_{self.back_index}" if key == BACK_KEY else key)
+        return atlas.subsurface(rect) if rect else None
+
+    def invalidate_scaled(self):
+        """Drop every scaled surface, e.g. after the card or window size changed"""
+        self._scaled.clear()
+
+    def stats(self):
+        return {
+            "faces_loaded": len(self._faces),
+            "atlas": self._atlas is not None,
+            "scaled_surfaces": len(self._scaled),
+            "scaled_hits": self.scaled_hits,
+            "scaled_misses": self.scaled_misses,
+        }
+
+    def face(self, key):
+        image = self._faces.get(key)
+        if image is None:
+            image = load_image(CARD_FACES_DIR / f"{key}.png")
+            self._faces[key] = image
+        return image
+
+    def back(self):
+        if self._back is None:
+            self._back = load_image(card_back_paths()[self.back_index])
+        return self._back
+
+
+class TextCache:
+    """
+    Shared pygame fonts (one per size) and an LRU cache of rendered text
+    surfaces, so per-frame UI text is rendered only when it changes.
+    """
+    def __init__(self, max_surfaces=256):
+        self.max_surfaces = max_surfaces
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.font_hits = 0
+        self.font_misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+
+    def font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            self.font_misses += 1
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, text, size, color=(255, 255, 255)):
+        cache_key = (text, size, color)
+        surface = self._surfaces.get(cache_key)
+        if surface is None:
+            self.text_misses += 1
+            surface = self.font(size).render(text, True, color)
+            self._surfaces[cache_key] = surface
+            if len(self._surfaces) > self.max_surfaces:
+                self._surfaces.popitem(last=False)
+        else:
+            self.text_hits += 1
+            self._surfaces.move_to_end(cache_key)
+        return surface
+
+    def stats(self):
+        return {
+            "fonts": len(self._fonts),
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "text_surfaces": len(self._surfaces),
+            "text_hits": self.text_hits,
+            "text_misses": self.text_misses,
+        }
+
 
-def load_card_backs():
-    return [load_image(p) for p in CARD_BACKS_DIR.glob("*.png")]
+if __name__ == "__main__":
+    # Asset build step: python assets_manager.py
+    _, index = build_atlas(CARD_SIZE)
+    print(f"Packed {len(index['rects'])} card images into {atlas_paths(CARD_SIZE)[0]}")
@@ -0,0 +1,144 @@
+"""
+Headless batch solver for deal corpora.
+
+Reads deals as JSONL from a file or stdin, one object per line, either a
+seeded deal or an explicit layout (cards as in gameState.parse_card, "[..]"
+for face-down, columns bottom to top, stockpile in dealing order):
+
+    {"id": "a", "seed": 42}
+    {"id": "b", "columns": [["[5S]", "KH", ...], ...], "stockpile": ["2C", ...]}
+
+and writes one JSON line per deal as soon as it is solved (so in completion
+order, not input order):
+
+    python batch_solve.py deals.jsonl --workers 8 --time-limit 30 > results.jsonl
+
+Deals are read lazily and at most --max-in-flight are queued on the pool at
+once, so memory stays flat however long the input is.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, Tuple
+
+from benchmark import solve_with_time_limit
+from gameState import GameState
+from spiderSolver import STRATEGIES
+
+
+def read_deals(lines) -> Iterator[Tuple[int, dict]]:
+    """(line number, parsed object) for every non-blank line; bad JSON becomes an error entry"""
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            deal = json.loads(line)
+            if not isinstance(deal, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            deal = {"error": f"bad JSON: {e}"}
+        yield line_no, deal
+
+
+def deal_state(deal: dict) -> GameState:
+    if "seed" in deal:
+        return GameState.from_seed(deal["seed"])
+    if "columns" in deal:
+        return GameState.from_layout(deal["columns"], deal.get("stockpile", ()))
+    raise ValueError("deal needs a 'seed' or 'columns'")
+
+
+def encode_moves(moves):
+    return ["deal" if move.is_deal() else [move.from_col, move.to_col, move.num_cards] for move in moves]
+
+
+def solve_deal(job) -> dict:
+    """Pool worker: solve one deal and return its result line"""
+    line_no, deal, time_limit, solver_options = job
+    result = {"line": line_no}
+    if "id" in deal:
+        result["id"] = deal["id"]
+    if "error" in deal:
+        result["error"] = deal["error"]
+        return result
+    try:
+        state = deal_state(deal)
+    except (TypeError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+
+    try:
+        moves, solver = solve_with_time_limit(state, time_limit, **solver_options)
+    except Exception as e:
+        # Anything else is a solver bug; report it on this deal's line rather
+        # than letting future.result() take the whole batch down
+        result["error"] = f"solver failed: {type(e).__name__}: {e}"
+        return result
+    result.update({
+        "solved": moves is not None,
+        "timed_out": solver.cancelled,
+        "moves": encode_moves(moves) if moves is not None else None,
+        "states_explored": solver.states_explored,
+        "elapsed": round(solver.elapsed, 4),
+    })
+    return result
+
+
+def run_batch(lines, out, workers: int, max_in_flight: int, time_limit: float, **solver_options) -> dict:
+    """Solve every deal in lines on a process pool, writing result lines to out as they finish"""
+    counts = {"deals": 0, "solved": 0, "timed_out": 0, "errors": 0}
+    deals = read_deals(lines)
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Top up the pool, then wait for at least one result
+            for line_no, deal in deals:
+                pending.add(pool.submit(solve_deal, (line_no, deal, time_limit, solver_options)))
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                counts["deals"] += 1
+                if "error" in result:
+                    counts["errors"] += 1
+                elif result["solved"]:
+                    counts["solved"] += 1
+                elif result["timed_out"]:
+                    counts["timed_out"] += 1
+                out.write(json.dumps(result) + "\n")
+            out.flush()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a JSONL corpus of Spider deals")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL deals file, '-' for stdin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="deals queued on the pool at once (default: 2 per worker)")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="seconds allowed per deal")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="dfs")
+    parser.add_argument("--table-mb", type=int, default=256, help="transposition table size per worker in MiB")
+    args = parser.parse_args(argv)
+
+    max_in_flight = args.max_in_flight or 2 * args.workers
+    solver_options = {"strategy": args.strategy, "table_bytes": args.table_mb * 1024 * 1024}
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        counts = run_batch(source, sys.stdout, args.workers, max_in_flight, args.time_limit, **solver_options)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"{counts['deals']} deals: {counts['solved']} solved, {counts['timed_out']} timed out, "
+          f"{counts['errors']} errors", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Headless solver benchmark.
+
+Runs SpiderSolver over a fixed corpus of seeded deals (GameState.from_seed,
+no display or card assets needed) and writes the results as JSON so runs
+can be compared across commits:
+
+    python benchmark.py --deals 20 --time-limit 10 --output bench.json
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import time
+from typing import List, Optional
+
+from gameState import GameState
+from solverStats import NULL_STATS, SolverStats
+from spiderSolver import SpiderSolver, STRATEGIES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for an empty list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def solve_with_time_limit(state: GameState, time_limit: float, workers: int = 0, **solver_options):
+    """
+    Solve state, cancelling the search after time_limit seconds; returns
+    (moves or None, solver). workers > 0 runs solve_parallel on that many processes.
+    """
+    solver = SpiderSolver(state, verbose=False, progress_interval=500, **solver_options)
+    deadline = time.perf_counter() + time_limit
+
+    def on_progress(states_explored, depth, states_per_sec):
+        if time.perf_counter() >= deadline:
+            solver.cancel()
+
+    solver.progress_callback = on_progress
+    moves = solver.solve_parallel(workers) if workers else solver.solve()
+    solver.close()
+    return moves, solver
+
+
+def run_deal(seed: int, time_limit: float, **solver_options) -> dict:
+    """Solve one seeded deal, cancelling the search after time_limit seconds"""
+    moves, solver = solve_with_time_limit(GameState.from_seed(seed), time_limit, **solver_options)
+
+    result = solver.get_stats()
+    result["seed"] = seed
+    result["solved"] = moves is not None
+    result["timed_out"] = solver.cancelled
+    return result
+
+
+def phase_seconds(results: List[dict]) -> dict:
+    """Estimated seconds per solver phase summed over every deal, slowest first"""
+    totals = {}
+    for result in results:
+        for phase, timing in result.get("profile", {}).get("phases", {}).items():
+            totals[phase] = totals.get(phase, 0.0) + timing["seconds"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def run_benchmark(seeds: List[int], time_limit: float, **solver_options) -> dict:
+    results = []
+    for seed in seeds:
+        result = run_deal(seed, time_limit, **solver_options)
+        results.append(result)
+        outcome = "solved" if result["solved"] else "timeout" if result["timed_out"] else "unsolved"
+        print(f"seed {seed}: {outcome}, {result['states_explored']} states, "
+              f"{result['elapsed']:.2f}s, {result['nodes_per_sec']:.0f} nodes/s, "
+              f"pruned {result['pruned_bound'] + result['pruned_dead_end']}")
+
+    solve_times = [r["elapsed"] for r in results if r["solved"]]
+    total_states = sum(r["states_explored"] for r in results)
+    total_time = sum(r["elapsed"] for r in results)
+    summary = {
+        "deals": len(results),
+        "solved": sum(1 for r in results if r["solved"]),
+        "unsolved": sum(1 for r in results if not r["solved"] and not r["timed_out"]),
+        "timed_out": sum(1 for r in results if r["timed_out"]),
+        "states_explored": total_states,
+        "pruned_bound": sum(r["pruned_bound"] for r in results),
+        "pruned_dead_end": sum(r["pruned_dead_end"] for r in results),
+        "skipped_reversals": sum(r["skipped_reversals"] for r in results),
+        "skipped_commuting": sum(r["skipped_commuting"] for r in results),
+        "phase_seconds": phase_seconds(results),
+        "elapsed": total_time,
+        "nodes_per_sec": total_states / total_time if total_time else 0.0,
+        "time_to_solution_p50": percentile(solve_times, 50),
+        "time_to_solution_p90": percentile(solve_times, 90),
+        "time_to_solution_p99": percentile(solve_times, 99),
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+    return {"summary": summary, "deals": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SpiderSolver on seeded deals")
+    parser.add_argument("--deals", type=int, default=20, help="number of deals in the corpus")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first deal")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds allowed per deal")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="dfs")
+    parser.add_argument("--no-pruning", action="store_true", help="disable bound and dead-end pruning")
+    parser.add_argument("--no-move-reduction", action="store_true",
+                        help="explore reversals and every order of commuting moves")
+    parser.add_argument("--table-file", default=None,
+                        help="use a memory-mapped transposition table in this file (sized by --table-mb)")
+    parser.add_argument("--table-mb", type=int, default=256, help="transposition table size in MiB")
+    parser.add_argument("--table-resume", action="store_true",
+                        help="keep states finished by earlier runs in --table-file")
+    parser.add_argument("--parallel", type=int, default=0, metavar="WORKERS",
+                        help="race orderings and root subtrees on this many processes (solve_parallel)")
+    parser.add_argument("--sample-every", type=int, default=16,
+                        help="time solver phases on one node in N (1: every node, 0: no solver stats)")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--label", default=None, help="free-form label stored with the results")
+    args = parser.parse_args(argv)
+    if args.parallel and args.table_file:
+        parser.error("--parallel workers cannot share a --table-file")
+
+    seeds = list(range(args.first_seed, args.first_seed + args.deals))
+    report = run_benchmark(seeds, args.time_limit, strategy=args.strategy, pruning=not args.no_pruning,
+                           move_reduction=not args.no_move_reduction, table_bytes=args.table_mb * 1024 * 1024,
+                           table_path=args.table_file, table_resume=args.table_resume, workers=args.parallel,
+                           stats=SolverStats(sample_every=args.sample_every) if args.sample_every else NULL_STATS)
+    report["config"] = {
+        "seeds": seeds,
+        "time_limit": args.time_limit,
+        "strategy": args.strategy,
+        "pruning": not args.no_pruning,
+        "move_reduction": not args.no_move_reduction,
+        "table_file": args.table_file,
+        "table_mb": args.table_mb,
+        "parallel": args.parallel,
+        "sample_every": args.sample_every,
+        "label": args.label,
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    summary = report["summary"]
+    print(f"Solved {summary['solved']}/{summary['deals']} "
+          f"({summary['timed_out']} timed out), {summary['states_explored']} states, "
+          f"{summary['nodes_per_sec']:.0f} nodes/s")
+    phase_total = sum(summary["phase_seconds"].values())
+    for phase, seconds in summary["phase_seconds"].items():
+        print(f"  {phase:<10} {seconds:8.2f}s {100 * seconds / phase_total:5.1f}%")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
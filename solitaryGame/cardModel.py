@@ -0,0 +1,38 @@
+import random
+
+SUITS = ["hearts", "diamonds", "clubs", "spades"]
+RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+RANK_NAME = {"A": "ace", "J": "jack", "Q": "queen", "K": "king"}
+
+
+class CardModel:
+    """A playing card with no rendering attached; safe to use without pygame"""
+    def __init__(self, suit, rank):
+        self.suit = suit
+        self.rank = rank
+        self.face_up = False
+
+    def image_key(self):
+        return f"{RANK_NAME.get(self.rank, self.rank)}_of_{self.suit}"
+
+    def __repr__(self):
+        return f"{self.rank} of {self.suit}{'' if self.face_up else ' (face down)'}"
+
+
+class DeckModel:
+    """One 52-card deck in suit-major order; subclasses choose the card class"""
+    def __init__(self):
+        self.cards = [self.make_card(suit, rank) for suit in SUITS for rank in RANKS]
+
+    def make_card(self, suit, rank):
+        return CardModel(suit, rank)
+
+    def shuffle(self, seed=None):
+        """Shuffle in place; a seed gives the same deal as GameState.from_seed(seed)"""
+        if seed is None:
+            random.shuffle(self.cards)
+        else:
+            random.Random(seed).shuffle(self.cards)
+
+    def deal(self):
+        return self.cards.pop() if self.cards else None
@@ -1,21 +1,25 @@
 import pygame
-from assets_manager import load_image
-RANK_NAME = {"A": "ace", "J": "jack", "Q": "queen", "K": "king"}
-class Card:
-    def __init__(self, suit, rank,faces,back_img):
-        self.suit = suit
-        self.rank = rank
-        self.face_up = False
+from cardModel import CardModel
+from assets_manager import BACK_KEY
+
+
+class Card(CardModel):
+    def __init__(self, suit, rank, images):
+        super().__init__(suit, rank)
         self.rect = pygame.Rect(0, 0, 80, 120)
-        self.front_face=faces[self.image_key()]
-        self.back_img = back_img
+        self.images = images
+
+    @property
+    def front_face(self):
+        # Decoded on first use, then shared through the images cache
+        return self.images.face(self.image_key())
 
-    def image_key(self):
-        return f"{RANK_NAME.get(self.rank, self.rank)}_of_{self.suit}"
+    @property
+    def back_img(self):
+        return self.images.back()
 
     def draw(self, screen, x, y):
         self.rect.topleft = (x, y)
-        image_to_draw = self.front_face if self.face_up else self.back_img
-        image = pygame.transform.smoothscale(image_to_draw, (80, 120))
+        image_key = self.image_key() if self.face_up else BACK_KEY
+        image = self.images.scaled(image_key, self.rect.size)
         screen.blit(image, self.rect)
-        
\ No newline at end of file
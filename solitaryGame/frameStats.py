@@ -0,0 +1,129 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+from benchmark import percentile
+
+PHASES = ("events", "update", "draw")
+OVERLAY_FONT_SIZE = 20
+
+
+class FrameStats:
+    """
+    Per-frame timings for the main loop.
+
+    Each frame records how long every phase took and the full frame interval
+    (including the clock.tick wait). Rolling percentiles cover the last
+    `window` frames; a frame counts as dropped when its interval exceeds
+    1.5x the target frame time. Rows for the last `history` frames are kept
+    for dump().
+    """
+    def __init__(self, target_fps=60, window=300, history=36000):
+        self.frame_budget_ms = 1000 / target_fps
+        self.frame_times = deque(maxlen=window)
+        self.work_times = deque(maxlen=window)
+        self.phase_times = {phase: deque(maxlen=window) for phase in PHASES}
+        self.rows = deque(maxlen=history)
+        self.frames = 0
+        self.dropped_frames = 0
+        self.overlay_visible = False
+
+        self._frame_start = None
+        self._current = {}
+        self._overlay_font = None
+
+    def time_phase(self, phase, fn):
+        """Run fn() and record its duration under phase"""
+        start = time.perf_counter()
+        result = fn()
+        self._current[phase] = (time.perf_counter() - start) * 1000
+        return result
+
+    def end_frame(self):
+        """Close the frame; call once per loop iteration, after clock.tick"""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            frame_ms = (now - self._frame_start) * 1000
+            work_ms = sum(self._current.values())
+            self.frames += 1
+            if frame_ms > self.frame_budget_ms * 1.5:
+                self.dropped_frames += 1
+            self.frame_times.append(frame_ms)
+            self.work_times.append(work_ms)
+            for phase in PHASES:
+                self.phase_times[phase].append(self._current.get(phase, 0.0))
+
+            row = {"frame": self.frames, "frame_ms": frame_ms, "work_ms": work_ms}
+            for phase in PHASES:
+                row[f"{phase}_ms"] = self._current.get(phase, 0.0)
+            self.rows.append(row)
+        self._frame_start = now
+        self._current = {}
+
+    def summary(self):
+        if not self.frame_times:
+            return {"frames": 0, "dropped_frames": 0}
+        result = {
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "frame_p50_ms": percentile(self.frame_times, 50),
+            "frame_p95_ms": percentile(self.frame_times, 95),
+            "frame_p99_ms": percentile(self.frame_times, 99),
+            "work_p50_ms": percentile(self.work_times, 50),
+            "work_p99_ms": percentile(self.work_times, 99),
+        }
+        for phase in PHASES:
+            result[f"{phase}_avg_ms"] = sum(self.phase_times[phase]) / len(self.phase_times[phase])
+        return result
+
+    def overlay_lines(self, cache_stats=None):
+        summary = self.summary()
+        if not summary["frames"]:
+            return ["collecting frame stats..."]
+        lines = [
+            f"frame p50 {summary['frame_p50_ms']:.1f}  p95 {summary['frame_p95_ms']:.1f}  "
+            f"p99 {summary['frame_p99_ms']:.1f} ms",
+            f"work p50 {summary['work_p50_ms']:.2f}  p99 {summary['work_p99_ms']:.2f} ms  "
+            f"dropped {summary['dropped_frames']}/{summary['frames']}",
+            "  ".join(f"{phase} {summary[f'{phase}_avg_ms']:.2f}" for phase in PHASES) + " ms avg",
+        ]
+        for name, stats in (cache_stats or {}).items():
+            lines.append(f"{name}: " + ", ".join(f"{key} {value}" for key, value in stats.items()))
+        return lines
+
+    def overlay_rect(self, screen_rect, line_count, line_height=18, width=560):
+        height = line_count * line_height + 8
+        return pygame.Rect(screen_rect.left, screen_rect.bottom - height, width, height)
+
+    def draw_overlay(self, screen, cache_stats=None):
+        """
+        Draw the stats box in the bottom-left corner and return its rect.
+        Its lines change nearly every frame, so they are rendered directly
+        rather than through the board's TextCache, which they would only churn.
+        """
+        if self._overlay_font is None:
+            self._overlay_font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+        lines = self.overlay_lines(cache_stats)
+        rect = self.overlay_rect(screen.get_rect(), len(lines))
+        box = pygame.Surface(rect.size, pygame.SRCALPHA)
+        box.fill((0, 0, 0, 190))
+        screen.blit(box, rect)
+        for i, line in enumerate(lines):
+            screen.blit(self._overlay_font.render(line, True, (255, 255, 0)), (rect.x + 6, rect.y + 4 + i * 18))
+        return rect
+
+    def dump(self, path):
+        """Write the per-frame rows plus a summary; CSV for *.csv, JSON otherwise"""
+        rows = list(self.rows)
+        if str(path).endswith(".csv"):
+            fields = ["frame", "frame_ms", "work_ms"] + [f"{phase}_ms" for phase in PHASES]
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "frames": rows}, f, indent=2)
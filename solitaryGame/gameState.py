@@ -1,25 +1,424 @@
-
+import itertools
+import random
+import sys
+from array import array
+from collections import Counter
 from typing import List
-from cards import Card
+from constants import RANK_VALUE
+from cardModel import SUITS
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_NAME = {value: rank for rank, value in RANK_VALUE.items()}
+
+# Solver cards are small ints: face-up bit, 2 suit bits, 4 rank bits
+FACE_UP = 0x40
+SUIT_SHIFT = 4
+RANK_MASK = 0x0F
+KING = RANK_VALUE['K']
+ACE = RANK_VALUE['A']
+MAX_COPIES = 2  # Of any one card: layouts hold at most two decks
+
+# Zobrist table: one random 64-bit value per (column, height, card code),
+# plus one per stockpile size. Seeded so keys are stable between runs.
+MAX_COLUMN_HEIGHT = 104
+CARD_CODES = 128
+_zobrist_rng = random.Random(0x5B1DE7)
+
+
+def _zobrist_values(count: int) -> array:
+    """count seeded 64-bit values, drawn as one block of bytes (fast at import)"""
+    values = array('Q')
+    values.frombytes(_zobrist_rng.randbytes(8 * count))
+    if sys.byteorder == "big":
+        values.byteswap()  # Same keys on every platform
+    return values
+
+
+ZOBRIST_CARDS = _zobrist_values(10 * MAX_COLUMN_HEIGHT * CARD_CODES)
+ZOBRIST_STOCK = _zobrist_values(MAX_COLUMN_HEIGHT + 1)
+# Column-independent values per (height, card code), for canonical_key()
+ZOBRIST_COLUMN_CARDS = _zobrist_values(MAX_COLUMN_HEIGHT * CARD_CODES)
+KEY_MASK = (1 << 64) - 1
+
+
+# Face-up K→A run of each suit, as re-inserted when undoing a completed run
+COMPLETE_RUNS = {
+    FACE_UP | (suit << SUIT_SHIFT): bytes(FACE_UP | (suit << SUIT_SHIFT) | (KING - i) for i in range(13))
+    for suit in range(len(SUITS))
+}
+
+
+def encode_card(card) -> int:
+    """Encode a GUI Card (anything with suit, rank, face_up) as a solver card code"""
+    code = (SUIT_INDEX[card.suit] << SUIT_SHIFT) | RANK_VALUE[card.rank]
+    return code | FACE_UP if card.face_up else code
+
+
+SUIT_LETTERS = {suit[0].upper(): i for i, suit in enumerate(SUITS)}
+
+
+def parse_card(token: str) -> int:
+    """
+    Card code from a text token: rank then suit letter, e.g. "10H" or "KS",
+    wrapped in brackets ("[QD]") when face-down. Raises ValueError.
+    """
+    if not isinstance(token, str):
+        raise ValueError(f"Bad card token {token!r}")
+    face_down = token.startswith("[") and token.endswith("]")
+    text = token[1:-1] if face_down else token
+    rank, suit = text[:-1].upper(), text[-1:].upper()
+    if rank not in RANK_VALUE or suit not in SUIT_LETTERS:
+        raise ValueError(f"Bad card token {token!r}")
+    code = (SUIT_LETTERS[suit] << SUIT_SHIFT) | RANK_VALUE[rank]
+    return code if face_down else code | FACE_UP
+
+
+def card_rank(code: int) -> int:
+    return code & RANK_MASK
+
+
+def card_suit(code: int) -> int:
+    return (code >> SUIT_SHIFT) & 3
+
+
+def zobrist(col_idx: int, height: int, code: int) -> int:
+    return ZOBRIST_CARDS[(col_idx * MAX_COLUMN_HEIGHT + height) * CARD_CODES + code]
+
 
 class GameState:
-    def __init__(self, columns, stockpile):
+    """
+    Compact solver position.
+
+    Columns are bytearrays of card codes (bottom card first) and the
+    stockpile is a bytearray whose last byte is dealt first. Nothing here
+    references the GUI's Card objects, so states can be copied and mutated
+    freely without touching the board or sibling search branches.
+
+    For move generation each column's movable-run length is cached in
+    run_lengths and its top card's rank in top_ranks (0 for an empty column);
+    top_masks[r] is a bitmask of the columns with top rank r. Every mutator
+    refreshes the caches of the columns it touched. Once the stockpile is
+    empty column_hashes holds each column's column-order-free hash, kept up
+    to date like key, so canonical_key() never has to walk the cards; while
+    cards remain to be dealt it is None and costs nothing.
+    """
+    __slots__ = ('columns', 'stockpile', 'sequences_removed', 'key', 'run_lengths', 'top_ranks', 'top_masks',
+                 'column_hashes')
+
+    def __init__(self, columns: List[bytearray], stockpile: bytearray, sequences_removed=0, key=None,
+                 caches=None, column_hashes=None):
         self.columns = columns
         self.stockpile = stockpile
+        self.sequences_removed = sequences_removed
+        self.key = self.compute_key() if key is None else key
+        if column_hashes is None and not stockpile:
+            column_hashes = [self.column_hash(col_idx) for col_idx in range(len(columns))]
+        self.column_hashes = column_hashes
+        if caches is None:
+            self.run_lengths = [0] * len(columns)
+            self.top_ranks = [0] * len(columns)
+            self.top_masks = [0] * (KING + 2)
+            self.top_masks[0] = (1 << len(columns)) - 1
+            for col_idx in range(len(columns)):
+                self._refresh_column(col_idx)
+        else:
+            self.run_lengths, self.top_ranks, self.top_masks = caches
+
+    @classmethod
+    def from_cards(cls, columns, stockpile) -> 'GameState':
+        """Build a solver state from the GUI's lists of Card objects"""
+        return cls(
+            columns=[bytearray(encode_card(card) for card in col) for col in columns],
+            stockpile=bytearray(encode_card(card) for card in stockpile)
+        )
+
+    @classmethod
+    def from_layout(cls, columns, stockpile=()) -> 'GameState':
+        """
+        State from card tokens (see parse_card): each column bottom to top,
+        the stockpile in the order it is dealt. Stockpile cards are always
+        face-down, brackets or not. Raises ValueError for a layout the solver
+        can't represent: not exactly 10 columns, more than MAX_COLUMN_HEIGHT
+        cards in all (any column may grow to hold every card during a search),
+        more copies of a card than two decks hold, or a non-empty column with
+        a face-down top card.
+        """
+        if len(columns) != 10:
+            raise ValueError(f"Expected 10 columns, got {len(columns)}")
+        total = len(stockpile) + sum(len(col) for col in columns)
+        if total > MAX_COLUMN_HEIGHT:
+            raise ValueError(f"Layout holds {total} cards, at most {MAX_COLUMN_HEIGHT} allowed")
+        codes = []
+        for i, col in enumerate(columns):
+            cards = bytearray(parse_card(token) for token in col)
+            if cards and not cards[-1] & FACE_UP:
+                raise ValueError(f"Column {i} has a face-down top card")
+            codes.append(cards)
+        stock = bytearray(parse_card(token) & ~FACE_UP for token in reversed(stockpile))
+
+        copies = Counter(code & ~FACE_UP for code in itertools.chain(stock, *codes))
+        for code, count in copies.items():
+            if count > MAX_COPIES:
+                raise ValueError(f"{count} copies of {RANK_NAME[code & RANK_MASK]}{SUITS[card_suit(code)][0].upper()}, "
+                                 f"at most {MAX_COPIES} allowed")
+        return cls(columns=codes, stockpile=stock)
+
+    @classmethod
+    def from_seed(cls, seed) -> 'GameState':
+        """
+        Headless deal: the same layout GameBoard.setup_game produces after
+        Deck.shuffle(seed), built without pygame, a display or card assets.
+        """
+        deck = [(suit << SUIT_SHIFT) | rank for suit in range(len(SUITS)) for rank in range(ACE, KING + 1)]
+        random.Random(seed).shuffle(deck)
+
+        # Four rows dealt off the end of the deck, the last one face-up
+        columns = [bytearray() for _ in range(10)]
+        for row in range(4):
+            for col in columns:
+                col.append(deck.pop() | FACE_UP if row == 3 else deck.pop())
+
+        # The rest goes to the stockpile in dealing order
+        stockpile = bytearray(reversed(deck))
+        return cls(columns=columns, stockpile=stockpile)
+
+    def to_cards(self, cards):
+        """
+        Lay the given Card objects out as this state: returns (columns, stockpile)
+        lists and sets each card's face_up to match. Cards are matched by suit and
+        rank, so every code in the state needs a corresponding card.
+        """
+        pool = {}
+        for card in cards:
+            pool.setdefault(encode_card(card) & ~FACE_UP, []).append(card)
+
+        def take(code):
+            card = pool[code & ~FACE_UP].pop()
+            card.face_up = bool(code & FACE_UP)
+            return card
+
+        columns = [[take(code) for code in col] for col in self.columns]
+        stockpile = [take(code) for code in self.stockpile]
+        return columns, stockpile
 
     def copy(self):
         return GameState(
             columns=[col[:] for col in self.columns],
-            stockpile=self.stockpile[:]
+            stockpile=self.stockpile[:],
+            sequences_removed=self.sequences_removed,
+            key=self.key,
+            caches=(self.run_lengths[:], self.top_ranks[:], self.top_masks[:]),
+            column_hashes=None if self.column_hashes is None else self.column_hashes[:]
         )
+
+    def compute_key(self) -> int:
+        """Full 64-bit Zobrist key, O(cards). Moves keep self.key up to date incrementally."""
+        key = ZOBRIST_STOCK[len(self.stockpile)]
+        for col_idx in range(len(self.columns)):
+            key ^= self.column_key(col_idx)
+        return key
+
+    def canonical_key(self) -> int:
+        """
+        Key that ignores column order, O(columns). Only meaningful once the
+        stockpile is empty: until then deals tell the columns apart. Columns
+        are hashed without their index (column_hashes) and the hashes summed,
+        so any permutation of the same columns gets the same key.
+        """
+        hashes = self.column_hashes
+        if hashes is None:
+            hashes = [self.column_hash(col_idx) for col_idx in range(len(self.columns))]
+        return (ZOBRIST_STOCK[0] + sum(hashes)) & KEY_MASK
+
+    def column_hash(self, col_idx: int) -> int:
+        """Full column-order-free hash of one column, O(cards); see column_hashes"""
+        key = 0
+        for height, code in enumerate(self.columns[col_idx]):
+            key ^= ZOBRIST_COLUMN_CARDS[height * CARD_CODES + code]
+        return key
+
+    def column_key(self, col_idx: int) -> int:
+        key = 0
+        for height, code in enumerate(self.columns[col_idx]):
+            key ^= zobrist(col_idx, height, code)
+        return key
     
     def apply_move(self, move):
-        """Mutate state by applying a move"""
-        cards = self.columns[move.from_col][-move.num_cards:]
-        self.columns[move.from_col] = self.columns[move.from_col][:-move.num_cards]
-        self.columns[move.to_col].extend(cards)
+        """
+        Mutate state by applying a move, removing a K→A run it completes.
+        Returns an undo record for undo().
+        """
+        from_col, to_col, num_cards = move.from_col, move.to_col, move.num_cards
+        from_cards = self.columns[from_col]
+        to_cards = self.columns[to_col]
+        start = len(from_cards) - num_cards
+        dest_height = len(to_cards)
+
+        old_key = key = self.key
+        from_base = from_col * MAX_COLUMN_HEIGHT + start
+        to_base = to_col * MAX_COLUMN_HEIGHT + dest_height
+        for i in range(num_cards):
+            code = from_cards[start + i]
+            key ^= ZOBRIST_CARDS[(from_base + i) * CARD_CODES + code] ^ ZOBRIST_CARDS[(to_base + i) * CARD_CODES + code]
+        self.key = key
+
+        hashes = self.column_hashes
+        old_hashes = None
+        if hashes is not None:
+            old_hashes = from_hash, to_hash = hashes[from_col], hashes[to_col]
+            for i in range(num_cards):
+                code = from_cards[start + i]
+                from_hash ^= ZOBRIST_COLUMN_CARDS[(start + i) * CARD_CODES + code]
+                to_hash ^= ZOBRIST_COLUMN_CARDS[(dest_height + i) * CARD_CODES + code]
+            hashes[from_col] = from_hash
+            hashes[to_col] = to_hash
+
+        to_cards += from_cards[start:]
+        del from_cards[start:]
         
         # Flip card if needed
-        if self.columns[move.from_col] and not self.columns[move.from_col][-1].face_up:
-            self.columns[move.from_col][-1].face_up = True
+        flipped = bool(from_cards) and not from_cards[-1] & FACE_UP
+        if flipped:
+            self._flip_top(from_col)
+
+        removed = None
+        if dest_height + num_cards >= 13:
+            removed = self._remove_complete_run(to_col)
+
+        self._refresh_column(from_col)
+        self._refresh_column(to_col)
+        return (from_col, to_col, num_cards, flipped, removed, old_key, old_hashes)
+
+    def deal_row(self):
+        """
+        Deal one row from the stockpile (up to 10 cards, one per column) and
+        remove any K→A runs it completes. Returns an undo record for undo().
+        """
+        old_key = self.key
+        cards_to_deal = min(10, len(self.stockpile))
+        dealt = bytes(self.stockpile[-cards_to_deal:])
+
+        for col_idx in range(cards_to_deal):
+            self.deal_card(col_idx)
+
+        removals = []
+        for col_idx in range(cards_to_deal):
+            removed = self._remove_complete_run(col_idx)
+            if removed:
+                removals.append((col_idx, removed))
+                self._refresh_column(col_idx)
+
+        if not self.stockpile:
+            self.column_hashes = [self.column_hash(col_idx) for col_idx in range(len(self.columns))]
+        return (-1, dealt, removals, old_key)
+
+    def undo(self, record):
+        """Exactly restore the state from before apply_move()/deal_row() returned record"""
+        if record[0] == -1:
+            _, dealt, removals, old_key = record
+            for col_idx, removed in reversed(removals):
+                self._restore_complete_run(col_idx, removed)
+            for col_idx in range(len(dealt) - 1, -1, -1):
+                self.columns[col_idx].pop()
+                self._refresh_column(col_idx)
+            self.stockpile += dealt
+            self.column_hashes = None
+        else:
+            from_col, to_col, num_cards, flipped, removed, old_key, old_hashes = record
+            if removed:
+                self._restore_complete_run(to_col, removed)
+            from_cards = self.columns[from_col]
+            to_cards = self.columns[to_col]
+            if flipped:
+                from_cards[-1] &= ~FACE_UP
+            start = len(to_cards) - num_cards
+            from_cards += to_cards[start:]
+            del to_cards[start:]
+            self._refresh_column(from_col)
+            self._refresh_column(to_col)
+            if old_hashes is not None:
+                self.column_hashes[from_col], self.column_hashes[to_col] = old_hashes
+        self.key = old_key
+
+    def deal_card(self, col_idx: int):
+        """Move the top stockpile card face-up onto a column"""
+        self.key ^= ZOBRIST_STOCK[len(self.stockpile)]
+        code = self.stockpile.pop() | FACE_UP
+        self.key ^= ZOBRIST_STOCK[len(self.stockpile)]
+
+        column = self.columns[col_idx]
+        self.key ^= zobrist(col_idx, len(column), code)
+        column.append(code)
+        self._refresh_column(col_idx)
+
+    def _flip_top(self, col_idx: int):
+        column = self.columns[col_idx]
+        height = len(column) - 1
+        code = column[height]
+        self.key ^= zobrist(col_idx, height, code) ^ zobrist(col_idx, height, code | FACE_UP)
+        if self.column_hashes is not None:
+            self.column_hashes[col_idx] ^= (ZOBRIST_COLUMN_CARDS[height * CARD_CODES + code]
+                                            ^ ZOBRIST_COLUMN_CARDS[height * CARD_CODES + (code | FACE_UP)])
+        column[height] = code | FACE_UP
+
+    def _refresh_column(self, col_idx: int):
+        """Recompute the movable-run length and top-rank index entry of one column"""
+        column = self.columns[col_idx]
+        bit = 1 << col_idx
+        top = column[-1] if column else 0
+        rank = top & RANK_MASK
+        old_rank = self.top_ranks[col_idx]
+        if rank != old_rank:
+            self.top_masks[old_rank] &= ~bit
+            self.top_masks[rank] |= bit
+            self.top_ranks[col_idx] = rank
+
+        if not top & FACE_UP:
+            self.run_lengths[col_idx] = 0
+            return
+
+        # Walk down while cards stay face-up and one rank higher
+        length = 1
+        for i in range(len(column) - 2, -1, -1):
+            prev = column[i]
+            if not prev & FACE_UP or (prev & RANK_MASK) - (top & RANK_MASK) != 1:
+                break
+            top = prev
+            length += 1
+        self.run_lengths[col_idx] = length
+
+    def _remove_complete_run(self, col_idx: int):
+        # Returns (run suit bits, exposed card flipped) or None
+        column = self.columns[col_idx]
+        start = len(column) - 13
+        if start < 0:
+            return None
+
+        suit_bits = column[start] & ~RANK_MASK
+        if column[start] != suit_bits | KING or suit_bits & FACE_UP == 0:
+            return None
+        for i in range(1, 13):
+            if column[start + i] != suit_bits | (KING - i):
+                return None
+
+        for i in range(13):
+            self.key ^= zobrist(col_idx, start + i, column[start + i])
+        if self.column_hashes is not None:
+            for i in range(13):
+                self.column_hashes[col_idx] ^= ZOBRIST_COLUMN_CARDS[(start + i) * CARD_CODES + column[start + i]]
+        del column[start:]
+        self.sequences_removed += 1
+
+        flipped = bool(column) and not column[-1] & FACE_UP
+        if flipped:
+            self._flip_top(col_idx)
+        return (suit_bits, flipped)
 
+    def _restore_complete_run(self, col_idx: int, removed):
+        # Key and column hashes are restored wholesale by undo(); only the cards need putting back
+        suit_bits, flipped = removed
+        column = self.columns[col_idx]
+        if flipped:
+            column[-1] &= ~FACE_UP
+        column += COMPLETE_RUNS[suit_bits]
+        self.sequences_removed -= 1
@@ -1,3 +1,4 @@
+import threading
 import pygame
 from deck import Deck
 from cards import Card
@@ -5,7 +6,15 @@ from typing import List
 from constants import RANK_VALUE as RANK_VALUES
 from gameState import GameState
 from spiderSolver import SpiderSolver
+from solutionCache import SolutionCache, position_fingerprint
 from gameLogic import Move
+from assets_manager import TextCache
+from tweens import TweenEngine
+
+# Solution playback keeps a GameState snapshot every this many moves, so a
+# seek replays at most this many moves
+PLAYBACK_CHECKPOINT_INTERVAL = 25
+PLAYBACK_SPEEDS = (0.5, 1, 2, 4, 8, 16)
 
 
 def is_valid_spider_move(card_to_drop, target_card, strict_suit=False):
@@ -36,8 +45,29 @@ def is_valid_seq(seq: List[Card]):
         #     return False
     return True
         
+def replay_moves(state, moves):
+    """Apply solution moves, deals included, to a GameState in place"""
+    for move in moves:
+        if move.is_deal():
+            state.deal_row()
+        else:
+            state.apply_move(move)
+
+
+def draw_outline(surface, color, rect, width=2):
+    """
+    Same pixels as pygame.draw.rect(surface, color, rect, width), but built from
+    fills so it stays correct under a clip rect (draw.rect outlines the
+    clipped rectangle instead of clipping the outline).
+    """
+    x, y, w, h = rect
+    surface.fill(color, (x, y, w, width))
+    surface.fill(color, (x, y + h - width, w, width))
+    surface.fill(color, (x, y, width, h))
+    surface.fill(color, (x + w - width, y, width, h))
+
 class GameBoard:
-    def __init__(self,screen_width,screen_height,deck):
+    def __init__(self,screen_width,screen_height,deck,seed=None):
         self.screen_width=screen_width
         self.screen_height=screen_height
         self.card_width=80
@@ -49,8 +79,9 @@ class GameBoard:
         self.drag_offset = (0, 0)     
         self.original_col_index = None 
 
-        self.dealing_cards = []
-        self.deal_animation_speed = 15
+        # Deal and solve-playback cards in flight, as (card, target column) payloads
+        self.tweens = TweenEngine(speed=900)
+        self._pending_seq_check = None
 
 
         self.stockpile_pos = (self.screen_width - self.card_width - self.padding, self.screen_height-self.card_height-self.padding)
@@ -63,7 +94,9 @@ class GameBoard:
         self.stockpile = []
         self.gameCards: List[List[Card]] = [[] for _ in range(10)]
         self.stockpile = []
-        self.setup_game(deck)
+        self.card_images = deck.images
+        self.text_cache = TextCache()
+        self.setup_game(deck, seed)
 
         self.solve_button_rect = pygame.Rect(
             self.screen_width - 200,
@@ -76,39 +109,131 @@ class GameBoard:
         self.solution_moves = []
         self.current_move_index = 0
         self.move_animation_timer = 0
-        self.move_animation_delay = 30 
-        self.solving_cards = []  
+        self.move_animation_delay = 0.5  # seconds between solution moves
+        self.playback_speed = 1
+        self._playback_state = None  # state the solver started from
+        self._playback_cards = []
+        self._checkpoints = []
         self.solver_status = "Ready" 
+
+        # Background search: the worker thread only writes solver_progress and
+        # solver_result; update_solver() reads them once per frame
+        self.solver = None
+        self.solver_thread = None
+        self.solver_progress = None
+        self.solver_result = None
+        # Solutions already found for a position are replayed without searching
+        self.solution_cache = SolutionCache()
+        self._solve_fingerprint = None
+
+        # What the last draw() put on screen, for dirty-rectangle tracking
+        self._full_redraw = True
+        self._last_column_state = [((), 0)] * 10
+        self._last_stockpile_state = None
+        self._last_moving_rects = []
+        self._last_button_state = None
+        self._status_rect = None
+        self._extra_dirty = []
+
+    @property
+    def is_searching(self):
+        return self.solver_thread is not None
     
     def start_auto_solve(self):
         if self.is_solving:
             print("Already solving!")
             return
+
+        if self.is_searching:
+            # Clicking the button again cancels the running search
+            print("Cancelling auto-solve...")
+            self.solver.cancel()
+            self.solver_status = "Cancelling..."
+            return
+
+        if self.tweens or self._pending_seq_check is not None:
+            # Cards in flight aren't in any column yet, so a snapshot now
+            # would hand the solver a different position from the real board
+            print("Wait for the cards to land before solving")
+            return
         
         print("Starting auto-solve...")
         self.solver_status = "Solving..."
 
-        game_state = GameState(
-            columns=[col[:] for col in self.gameCards],
-            stockpile=self.stockpile[:]
-        )
+        # The solver works on its own compact copy; board Cards are never touched
+        game_state = GameState.from_cards(self.gameCards, self.stockpile)
+        self._playback_state = game_state.copy()
+        self._playback_cards = [card for col in self.gameCards for card in col] + self.stockpile
 
-        solver = SpiderSolver(game_state)
-        self.solution_moves = solver.solve()
+        self._solve_fingerprint = position_fingerprint(game_state)
+        cached = self.solution_cache.get(self._solve_fingerprint)
+        if cached is not None:
+            if self._solves(game_state, cached):
+                print(f"✓ Cached solution: {len(cached)} moves")
+                self._start_playback(cached)
+                return
+            self.solution_cache.discard(self._solve_fingerprint)
+
+        self.solver_progress = None
+        self.solver_result = None
+        self.solver = SpiderSolver(game_state, progress_callback=self._on_solver_progress)
+        self.solver_thread = threading.Thread(target=self._run_solver, args=(self.solver,), daemon=True)
+        self.solver_thread.start()
+
+    def _run_solver(self, solver):
+        """Worker thread body"""
+        self.solver_result = solver.solve()
+
+    def _on_solver_progress(self, states_explored, depth, states_per_sec):
+        # Called on the worker thread; a single tuple assignment is atomic
+        self.solver_progress = (states_explored, depth, states_per_sec)
+
+    def update_solver(self):
+        """Per-frame: show search progress and start playback when the search finishes"""
+        if not self.is_searching:
+            return
+
+        if self.solver_thread.is_alive():
+            if self.solver_progress and self.solver_status != "Cancelling...":
+                states_explored, depth, states_per_sec = self.solver_progress
+                self.solver_status = f"{states_explored} states, depth {depth}, {states_per_sec:.0f}/s"
+            return
+
+        solver = self.solver
+        self.solver = None
+        self.solver_thread = None
         
-        if self.solution_moves:
-            print(f"✓ Solution found! {len(self.solution_moves)} moves")
-            self.solver_status = f"Solving: {len(self.solution_moves)} moves"
-            self.is_solving = True
-            self.current_move_index = 0
-            self.move_animation_timer = 0
+        if self.solver_result:
+            print(f"✓ Solution found! {len(self.solver_result)} moves")
+            self.solution_cache.put(self._solve_fingerprint, self.solver_result)
+            self._start_playback(self.solver_result)
+        elif solver.cancelled:
+            print("✗ Auto-solve cancelled")
+            self.solver_status = "Cancelled"
         else:
             print("✗ No solution found")
             self.solver_status = "No solution found"
     
-    def update_auto_solve(self):
-        if self.solving_cards:
-            self.update_solve_animation()
+    def _start_playback(self, moves):
+        self.solution_moves = moves
+        self.solver_status = f"Solving: {len(moves)} moves"
+        self.is_solving = True
+        self.current_move_index = 0
+        self.move_animation_timer = 0
+        self._build_checkpoints()
+
+    @staticmethod
+    def _solves(state, moves):
+        """Replay moves on a copy of state; a cached entry must still clear the board"""
+        state = state.copy()
+        replay_moves(state, moves)
+        return all(not col for col in state.columns)
+
+    def update_auto_solve(self, dt):
+        # Playback speed scales both the tweens and the pause between moves
+        dt *= self.playback_speed
+        if self.tweens:
+            self.update_animations(dt)
             return
         
         # Check if we're done
@@ -119,7 +244,7 @@ class GameBoard:
             return
         
         # Wait before next move
-        self.move_animation_timer += 1
+        self.move_animation_timer += dt
         
         if self.move_animation_timer >= self.move_animation_delay:
             # Execute next move
@@ -128,7 +253,72 @@ class GameBoard:
             self._animate_solve_move(move)
             self.current_move_index += 1
             self.move_animation_timer = 0
-            self.solver_status = f"Move {self.current_move_index}/{len(self.solution_moves)}"
+            self._update_playback_status()
+
+    def _update_playback_status(self):
+        speed = f" x{self.playback_speed:g}" if self.playback_speed != 1 else ""
+        self.solver_status = f"Move {self.current_move_index}/{len(self.solution_moves)}{speed}"
+
+    def _build_checkpoints(self):
+        """Snapshot the solution's state every PLAYBACK_CHECKPOINT_INTERVAL moves"""
+        state = self._playback_state.copy()
+        self._checkpoints = [state.copy()]
+        for end in range(PLAYBACK_CHECKPOINT_INTERVAL, len(self.solution_moves) + 1, PLAYBACK_CHECKPOINT_INTERVAL):
+            replay_moves(state, self.solution_moves[end - PLAYBACK_CHECKPOINT_INTERVAL:end])
+            self._checkpoints.append(state.copy())
+
+    def seek_playback(self, move_index):
+        """
+        Jump playback to the position after move_index solution moves, without
+        animating: restore the nearest earlier checkpoint, replay the few moves
+        after it and lay the board out from the result.
+        """
+        if not self.is_solving:
+            return
+        move_index = max(0, min(move_index, len(self.solution_moves)))
+        checkpoint = move_index // PLAYBACK_CHECKPOINT_INTERVAL
+        state = self._checkpoints[checkpoint].copy()
+        replay_moves(state, self.solution_moves[checkpoint * PLAYBACK_CHECKPOINT_INTERVAL:move_index])
+
+        # Cards in flight are dropped; the state says where every card belongs
+        self.tweens.clear()
+        self._pending_seq_check = None
+        self.gameCards, self.stockpile = state.to_cards(self._playback_cards)
+        self.current_move_index = move_index
+        self.move_animation_timer = 0
+        self._update_playback_status()
+        self.request_full_redraw()
+
+    def finish_playback(self):
+        """Apply the rest of the solution at once; update_auto_solve() then reports it solved"""
+        self.seek_playback(len(self.solution_moves))
+
+    def change_playback_speed(self, step):
+        speeds = PLAYBACK_SPEEDS
+        index = speeds.index(self.playback_speed) if self.playback_speed in speeds else speeds.index(1)
+        self.playback_speed = speeds[max(0, min(len(speeds) - 1, index + step))]
+        self._update_playback_status()
+
+    def handle_playback_key(self, key):
+        """Playback controls: End finishes, +/- change speed, arrows and PgUp/PgDn seek, Home restarts"""
+        # A move in flight counts as done, so stepping back lands before it
+        index = self.current_move_index
+        if key == pygame.K_END:
+            self.finish_playback()
+        elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.change_playback_speed(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.change_playback_speed(-1)
+        elif key == pygame.K_RIGHT:
+            self.seek_playback(index if self.tweens else index + 1)
+        elif key == pygame.K_LEFT:
+            self.seek_playback(index - 1)
+        elif key == pygame.K_PAGEUP:
+            self.seek_playback(index + 10)
+        elif key == pygame.K_PAGEDOWN:
+            self.seek_playback(index - 10)
+        elif key == pygame.K_HOME:
+            self.seek_playback(0)
     
     def _animate_solve_move(self, move: Move):
         if move.is_deal():
@@ -152,84 +342,15 @@ class GameBoard:
             dest_col_len = len(self.gameCards[move.to_col])
             
             for i, card in enumerate(cards_to_move):
-                self.solving_cards.append({
-                    'card': card,
-                    'target_col_index': move.to_col,
-                    'current_x': source_x,
-                    'current_y': source_y + i * self.padding,
-                    'target_x': target_x,
-                    'target_y': target_y + (dest_col_len + i) * self.padding
-                })
-    
-    def update_solve_animation(self):
-        if not self.solving_cards:
-            return
-        
-        cards_to_remove = []
-        
-        for solve_data in self.solving_cards:
-            card = solve_data['card']
-            
-            # Calculate direction to target
-            dx = solve_data['target_x'] - solve_data['current_x']
-            dy = solve_data['target_y'] - solve_data['current_y']
-            
-            # Calculate distance
-            distance = (dx**2 + dy**2) ** 0.5
-            
-            if distance < self.deal_animation_speed:
-                # Reached destination
-                self.gameCards[solve_data['target_col_index']].append(card)
-                cards_to_remove.append(solve_data)
-            else:
-                # Move towards target
-                ratio = self.deal_animation_speed / distance
-                solve_data['current_x'] += dx * ratio
-                solve_data['current_y'] += dy * ratio
-                
-                # Update card rect for drawing
-                card.rect.x = int(solve_data['current_x'])
-                card.rect.y = int(solve_data['current_y'])
-        
-        # Remove finished animations
-        for solve_data in cards_to_remove:
-            self.solving_cards.remove(solve_data)
-        
-        # After all cards reach destination, check for complete sequences
-        if not self.solving_cards and cards_to_remove:
-            # Check the destination column for complete sequences
-            dest_col = cards_to_remove[0]['target_col_index']
-            self.check_and_remove_complete_seq(dest_col)
+                start = (source_x, source_y + i * self.padding)
+                card.rect.topleft = start
+                self.tweens.add((card, move.to_col), start,
+                                (target_x, target_y + (dest_col_len + i) * self.padding))
+            # Once every card has landed, the destination may hold a complete run
+            self._pending_seq_check = move.to_col
     
-    def deal_from_stockpile(self):
-        if len(self.stockpile) == 0:
-            print("STOCKPILE IS EMPTY!")
-            return
-        
-        for col in self.gameCards:
-            if len(col) == 0:
-                print("Cannot deal - all columns must have at least one card!")
-                return
-        
-        cards_to_deal = min(10, len(self.stockpile))
-
-        for i in range(cards_to_deal):
-            card:Card = self.stockpile.pop()
-            card.face_up = True
-            target_col = self.gameCards[i]
-            start_x,start_y = self.tableau_positions[i]
-            target_y = start_y + (len(target_col) * self.padding)
-            self.dealing_cards.append({
-                'card': card,
-                'target_col_index': i,
-                'current_x': self.stockpile_pos[0],
-                'current_y': self.stockpile_pos[1],
-                'target_x': start_x,
-                'target_y': target_y
-            })
-
-    def setup_game(self,deck:Deck):
-        deck.shuffle()
+    def setup_game(self,deck:Deck,seed=None):
+        deck.shuffle(seed)
         for i in range(4):
             for col in range(10):
                 card = deck.deal()
@@ -253,12 +374,13 @@ class GameBoard:
                     self.card_width,
                     self.card_height
                 )
+                # The board stays frozen while a search is running on it
+                if self.is_solving or self.is_searching:
+                    return
                 if stockpile_rect.collidepoint(event.pos):
-                    if not self.is_solving:
-                        self.deal_from_stockpile()
+                    self.deal_from_stockpile()
                 else:
-                    if not self.is_solving:
-                        self.handle_drag_start(event.pos)
+                    self.handle_drag_start(event.pos)
         
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
@@ -276,6 +398,18 @@ class GameBoard:
                 for i in range(1, len(self.dragged_cards)):
                     self.dragged_cards[i].rect.x = self.dragged_cards[0].rect.x
                     self.dragged_cards[i].rect.y = self.dragged_cards[0].rect.y + (i * self.padding)
+
+        elif event.type == pygame.KEYDOWN:
+            if self.is_solving:
+                self.handle_playback_key(event.key)
+
+        elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+            # Scaled card surfaces are only valid for the current layout
+            self.card_images.invalidate_scaled()
+            self.request_full_redraw()
+
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.request_full_redraw()
     
     def deal_from_stockpile(self):
         if len(self.stockpile) == 0:
@@ -295,71 +429,65 @@ class GameBoard:
             target_col = self.gameCards[i]
             start_x,start_y = self.tableau_positions[i]
             target_y = start_y + (len(target_col) * self.padding)
-            self.dealing_cards.append({
-                'card': card,
-                'target_col_index': i,
-                'current_x': self.stockpile_pos[0],
-                'current_y': self.stockpile_pos[1],
-                'target_x': start_x,
-                'target_y': target_y
-            })
-
-    def update_animations(self):
-        """Update positions of cards being dealt"""
-        if not self.dealing_cards:
+            start = self.stockpile_pos
+            card.rect.topleft = start
+            self.tweens.add((card, i), start, (start_x, target_y))
+
+    def update_animations(self, dt):
+        """Move every card in flight by dt seconds and drop arrived cards into their column"""
+        if not self.tweens:
             return
-        
-        cards_to_remove = []
-        
-        for deal_data in self.dealing_cards:
-            card = deal_data['card']
-            
-            # Calculate direction to target
-            dx = deal_data['target_x'] - deal_data['current_x']
-            dy = deal_data['target_y'] - deal_data['current_y']
-            
-            # Calculate distance
-            distance = (dx**2 + dy**2) ** 0.5
-            
-            if distance < self.deal_animation_speed:
-                # Reached destination
-                self.gameCards[deal_data['target_col_index']].append(card)
-                cards_to_remove.append(deal_data)
-            else:
-                # Move towards target
-                ratio = self.deal_animation_speed / distance
-                deal_data['current_x'] += dx * ratio
-                deal_data['current_y'] += dy * ratio
-                
-                # Update card rect for drawing
-                card.rect.x = int(deal_data['current_x'])
-                card.rect.y = int(deal_data['current_y'])
-        
-        # Remove finished animations
-        for deal_data in cards_to_remove:
-            self.dealing_cards.remove(deal_data)
+
+        for card, target_col_index in self.tweens.step(dt):
+            self.gameCards[target_col_index].append(card)
+        for (card, _), x, y in self.tweens.items():
+            card.rect.topleft = (int(x), int(y))
+
+        if not self.tweens and self._pending_seq_check is not None:
+            self.check_and_remove_complete_seq(self._pending_seq_check)
+            self._pending_seq_check = None
     
+    def column_at(self, x):
+        """Column whose card slot spans screen x, or None for the gaps and margins"""
+        offset = x - self.tableau_positions[0][0]
+        col_idx, within = divmod(offset, self.column_spacing)
+        if offset < 0 or col_idx >= len(self.tableau_positions) or within >= self.card_width:
+            return None
+        return int(col_idx)
+
+    def card_at(self, pos):
+        """
+        (column, card index) of the topmost card under pos, straight from the
+        fixed layout; card index is None over an empty column's slot.
+        """
+        col_idx = self.column_at(pos[0])
+        if col_idx is None:
+            return None
+        offset = pos[1] - self.tableau_positions[col_idx][1]
+        num_cards = len(self.gameCards[col_idx])
+        if offset < 0 or offset >= self._column_rect(col_idx, num_cards).height:
+            return None
+        if not num_cards:
+            return col_idx, None
+        return col_idx, min(offset // self.padding, num_cards - 1)
+
     def handle_drag_start(self,pos):
-        for col_idx,col_cards in enumerate(self.gameCards):
-            if not col_cards: #means if empty 
-                continue
-            
-            for card_idx in range(len(col_cards)-1,-1,-1):
-                card = col_cards[card_idx]
-                if not card.face_up:
-                    continue
-
-                if card.rect.collidepoint(pos):
-                    seq=col_cards[card_idx:]
-
-                    if is_valid_seq(seq):
-                        self.dragged_cards = seq
-                        self.original_col_index=col_idx
-                        self.drag_offset = (pos[0]-card.rect.x,pos[1]-card.rect.y)
-                    
-                        for _ in range(len(seq)):
-                            col_cards.pop()
-                        return
+        hit = self.card_at(pos)
+        if hit is None or hit[1] is None:
+            return
+        col_idx, card_idx = hit
+        col_cards = self.gameCards[col_idx]
+        card = col_cards[card_idx]
+        # Cards under the topmost one only add to its run, which is already invalid
+        if not card.face_up:
+            return
+
+        seq = col_cards[card_idx:]
+        if is_valid_seq(seq):
+            self.dragged_cards = seq
+            self.original_col_index = col_idx
+            self.drag_offset = (pos[0]-card.rect.x,pos[1]-card.rect.y)
+            del col_cards[card_idx:]
 
     def check_and_remove_complete_seq(self,col_idx):
         col = self.gameCards[col_idx]
@@ -391,27 +519,19 @@ class GameBoard:
         dropped_successfully = False
         first_card = self.dragged_cards[0]  # The top card of the sequence
 
-        for i, tableau_pos in enumerate(self.tableau_positions):
+        hit = self.card_at(pos)
+        if hit is not None:
+            i, card_idx = hit
             dest_col_cards = self.gameCards[i]
-            empty_slot_rect = pygame.Rect(tableau_pos[0], tableau_pos[1], self.card_width, self.card_height)
-
-            if not dest_col_cards:
+            if card_idx is None:
             # Empty column - only Kings can go here
-                if empty_slot_rect.collidepoint(pos):
-                    if first_card.rank == 'K':
-                        dest_col_cards.extend(self.dragged_cards)
-                        self.check_and_remove_complete_seq(i)
-                        dropped_successfully = True
-                        break
-            else:
-            # Non-empty column - check if valid move
-                top_card = dest_col_cards[-1]
-                if top_card.rect.collidepoint(pos):
-                    if is_valid_spider_move(first_card, top_card):
-                        dest_col_cards.extend(self.dragged_cards)
-                        self.check_and_remove_complete_seq(i)
-                        dropped_successfully = True
-                        break
+                dropped_successfully = first_card.rank == 'K'
+            elif card_idx == len(dest_col_cards) - 1:
+            # Non-empty column - only the top card takes a drop
+                dropped_successfully = is_valid_spider_move(first_card, dest_col_cards[-1])
+            if dropped_successfully:
+                dest_col_cards.extend(self.dragged_cards)
+                self.check_and_remove_complete_seq(i)
     
         if dropped_successfully:
         # Flip the new top card of source column
@@ -425,56 +545,152 @@ class GameBoard:
         self.dragged_cards = []
         self.original_col_index = None
             
-    def draw(self, screen):
+    def draw(self, screen, background="black"):
+        """
+        Retained-mode draw: repaint only the regions that changed since the
+        last call and return them for pygame.display.update(). The first call,
+        or one after request_full_redraw(), repaints the whole screen.
+        """
+        dirty = self._collect_dirty_rects(screen.get_rect())
+        for area in dirty:
+            screen.set_clip(area)
+            screen.fill(background, area)
+            self._draw_area(screen, area)
+        screen.set_clip(None)
+        return dirty
+
+    def request_full_redraw(self):
+        self._full_redraw = True
+
+    def invalidate(self, rect):
+        """Repaint rect on the next draw() even if nothing on the board changed there"""
+        self._extra_dirty.append(pygame.Rect(rect))
+
+    def _draw_area(self, screen, area):
+        """Draw everything that overlaps area, back to front"""
         for pos in self.tableau_positions:
-            pygame.draw.rect(screen, "darkgreen", (pos[0], pos[1], self.card_width, self.card_height), 2)
-        pygame.draw.rect(screen, "darkgreen", (self.stockpile_pos[0], self.stockpile_pos[1], self.card_width, self.card_height), 2)
+            slot = pygame.Rect(pos[0], pos[1], self.card_width, self.card_height)
+            if slot.colliderect(area):
+                draw_outline(screen, "darkgreen", slot)
 
         for i,col_cards in enumerate(self.gameCards):
+            if not self._column_rect(i, len(col_cards)).colliderect(area):
+                continue
             start_x,start_y= self.tableau_positions[i]
             for j,card in enumerate(col_cards):
                 card_y = start_y + (j*self.padding)
                 card.draw(screen,start_x,card_y)
         
-        for i, card in enumerate(self.stockpile):
-            card.draw(screen, self.stockpile_pos[0], self.stockpile_pos[1])
-        for deal_data in self.dealing_cards:
-            card = deal_data['card']
-            screen.blit(card.front_face, card.rect)
-        
-        for solve_data in self.solving_cards:
-            card = solve_data['card']
-            screen.blit(card.front_face, card.rect)
-        
-        # Draw dragged cards
-        if self.dragged_cards:
-            for card in self.dragged_cards:
-                screen.blit(card.front_face, card.rect)
-        
-        if self.dragged_cards:
-            for card in self.dragged_cards:
-                screen.blit(card.front_face, card.rect)
+        stockpile_rect = pygame.Rect(self.stockpile_pos[0], self.stockpile_pos[1], self.card_width, self.card_height)
+        if stockpile_rect.colliderect(area):
+            draw_outline(screen, "darkgreen", stockpile_rect)
+            # Stockpile cards all sit at the same spot; only the top one shows
+            if self.stockpile:
+                self.stockpile[-1].draw(screen, self.stockpile_pos[0], self.stockpile_pos[1])
+
+        for card in self._moving_cards():
+            if card.rect.colliderect(area):
+                card.draw(screen, *card.rect.topleft)
         
-        self.draw_solve_button(screen)
+        if self._button_region(self._status_rect).colliderect(area):
+            self.draw_solve_button(screen)
+
+    def _collect_dirty_rects(self, screen_rect):
+        """Compare this frame with the last drawn one and list the regions that changed"""
+        column_state = [(tuple((id(card), card.face_up) for card in col), len(col)) for col in self.gameCards]
+        stockpile_state = (len(self.stockpile), self.stockpile[-1].face_up if self.stockpile else None)
+        moving_rects = [card.rect.copy() for card in self._moving_cards()]
+        button_state = (self.is_searching, self.is_solving, self.solver_status)
+        status_rect = self._status_rect if button_state == self._last_button_state else self._measure_status()
+
+        if self._full_redraw:
+            dirty = [screen_rect]
+            self._full_redraw = False
+        else:
+            dirty = []
+            for i, (state, length) in enumerate(column_state):
+                last_state, last_length = self._last_column_state[i]
+                if state != last_state:
+                    dirty.append(self._column_rect(i, max(length, last_length)))
+            if stockpile_state != self._last_stockpile_state:
+                dirty.append(pygame.Rect(self.stockpile_pos[0], self.stockpile_pos[1], self.card_width, self.card_height))
+            if moving_rects != self._last_moving_rects:
+                dirty.extend(self._last_moving_rects)
+                dirty.extend(moving_rects)
+            if button_state != self._last_button_state:
+                dirty.append(self._button_region(self._status_rect).union(self._button_region(status_rect)))
+            dirty.extend(self._extra_dirty)
+        self._extra_dirty = []
+
+        self._last_column_state = column_state
+        self._last_stockpile_state = stockpile_state
+        self._last_moving_rects = moving_rects
+        self._last_button_state = button_state
+        self._status_rect = status_rect
+        return self._merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+
+    @staticmethod
+    def _merge_rects(rects):
+        # Overlapping regions are repainted once as their union
+        merged = []
+        for rect in rects:
+            for i, other in enumerate(merged):
+                if rect.colliderect(other):
+                    merged[i] = other.union(rect)
+                    break
+            else:
+                merged.append(rect)
+        return merged
+
+    def _column_rect(self, col_idx, num_cards):
+        """Screen area of a column holding num_cards cards (at least one card slot)"""
+        x, y = self.tableau_positions[col_idx]
+        height = self.card_height + max(0, num_cards - 1) * self.padding
+        return pygame.Rect(x, y, self.card_width, height)
+
+    def _moving_cards(self):
+        """Cards drawn at their own rect: dealing, solve animation and dragged cards"""
+        cards = [card for card, _ in self.tweens.payloads()]
+        cards.extend(self.dragged_cards)
+        return cards
+
+    def _button_region(self, status_rect):
+        return self.solve_button_rect.union(status_rect) if status_rect else self.solve_button_rect.copy()
+
+    def _measure_status(self):
+        """Where draw_solve_button will put the status text, or None"""
+        if not self.solver_status:
+            return None
+        width, height = self.text_cache.font(24).size(self.solver_status)
+        status_rect = pygame.Rect(0, 0, width, height)
+        status_rect.centerx = self.solve_button_rect.centerx
+        status_rect.top = self.solve_button_rect.bottom + 5
+        return status_rect
 
     def draw_solve_button(self, screen):
         """Draw the solve button"""
         # Button background
-        button_color = (0, 150, 0) if not self.is_solving else (150, 150, 150)
+        if self.is_searching:
+            button_color = (150, 100, 0)
+        elif self.is_solving:
+            button_color = (150, 150, 150)
+        else:
+            button_color = (0, 150, 0)
         pygame.draw.rect(screen, button_color, self.solve_button_rect)
-        pygame.draw.rect(screen, (255, 255, 255), self.solve_button_rect, 2)
+        draw_outline(screen, (255, 255, 255), self.solve_button_rect)
         
         # Button text
-        font = pygame.font.Font(None, 32)
-        text = "Solving..." if self.is_solving else "Solve"
-        text_surface = font.render(text, True, (255, 255, 255))
+        if self.is_searching:
+            text = "Cancel"
+        else:
+            text = "Solving..." if self.is_solving else "Solve"
+        text_surface = self.text_cache.render(text, 32)
         text_rect = text_surface.get_rect(center=self.solve_button_rect.center)
         screen.blit(text_surface, text_rect)
         
         # Status text below button
         if self.solver_status:
-            status_font = pygame.font.Font(None, 24)
-            status_surface = status_font.render(self.solver_status, True, (255, 255, 255))
+            status_surface = self.text_cache.render(self.solver_status, 24)
             status_rect = status_surface.get_rect(
                 centerx=self.solve_button_rect.centerx,
                 top=self.solve_button_rect.bottom + 5
@@ -1,6 +1,9 @@
+import os
+
 import pygame
 
 from cards import Card
+from frameStats import FrameStats
 from game_board import GameBoard
 from deck import Deck
 
@@ -17,35 +20,71 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 BG_COLOR = "black"
 
+# F3 toggles the overlay; set SOLITAIRE_FRAME_STATS=frames.csv (or .json)
+# to write the per-frame timings out on exit
+frame_stats = FrameStats(FPS)
+FRAME_STATS_PATH = os.environ.get("SOLITAIRE_FRAME_STATS")
+
 
 running = True
 dt = 0
 def handle_events():
     global running
+    # Only the latest mouse position matters, so queued motion events are
+    # collapsed to one, dispatched before the next other event (keeping
+    # order with clicks) or at the end of the frame
+    pending_motion = None
     for event in pygame.event.get():
+        if event.type == pygame.MOUSEMOTION:
+            pending_motion = event
+            continue
+        if pending_motion is not None:
+            game_board.handle_event(pending_motion)
+            pending_motion = None
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            frame_stats.overlay_visible = not frame_stats.overlay_visible
+            game_board.request_full_redraw()
+            continue
         game_board.handle_event(event)
+    if pending_motion is not None:
+        game_board.handle_event(pending_motion)
 
 def update():
-    
+    game_board.update_solver()
 
     if game_board.is_solving:
-        game_board.update_auto_solve()
+        game_board.update_auto_solve(dt)
     else:
-        game_board.update_animations()
+        game_board.update_animations(dt)
 
 def draw():
-    screen.fill(BG_COLOR)
-    game_board.draw(screen)
-    pygame.display.flip()
+    # Only the regions the board repainted are pushed to the display
+    dirty = game_board.draw(screen, BG_COLOR)
+    if frame_stats.overlay_visible:
+        cache_stats = {"cards": game_board.card_images.stats(), "text": game_board.text_cache.stats()}
+        overlay = frame_stats.draw_overlay(screen, cache_stats)
+        dirty.append(overlay)
+        # The overlay sits on top of the board, so its area is repainted every frame
+        game_board.invalidate(overlay)
+    if dirty:
+        pygame.display.update(dirty)
 
 while running:
-    handle_events()
-    update()
-    draw()
+    frame_stats.time_phase("events", handle_events)
+    frame_stats.time_phase("update", update)
+    frame_stats.time_phase("draw", draw)
     dt = clock.tick(FPS) / 1000
-
+    frame_stats.end_frame()
+
+stats = game_board.card_images.stats()
+print(f"Scaled card cache: {stats['scaled_hits']} hits, {stats['scaled_misses']} misses, "
+      f"{stats['scaled_surfaces']} surfaces")
+game_board.solution_cache.close()
+if FRAME_STATS_PATH:
+    frame_stats.dump(FRAME_STATS_PATH)
+    print(f"Frame stats written to {FRAME_STATS_PATH}")
 pygame.quit()
 
 
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from constants import BASE
+from gameLogic import Move
+from gameState import GameState
+
+DEFAULT_PATH = BASE / "assets" / "cache" / "solutions.sqlite"
+
+
+def position_fingerprint(state: GameState) -> str:
+    """
+    Hex digest of every column and the stockpile, face-down cards included.
+    Built from card codes only, so the same deal or position gets the same
+    fingerprint no matter which Card objects or session produced it.
+    """
+    digest = hashlib.sha1()
+    for col in state.columns:
+        digest.update(bytes(col))
+        digest.update(b"|")
+    digest.update(b"#")
+    digest.update(bytes(state.stockpile))
+    return digest.hexdigest()
+
+
+def decode_moves(text: str) -> List[Move]:
+    """Moves from a stored row; raises ValueError for anything put() couldn't have written"""
+    rows = json.loads(text)
+    if not isinstance(rows, list):
+        raise ValueError(f"Bad move list {rows!r}")
+    moves = []
+    for fields in rows:
+        if not isinstance(fields, list) or len(fields) != 4:
+            raise ValueError(f"Bad move {fields!r}")
+        from_col, to_col, num_cards, rank = fields
+        if not all(type(n) is int for n in (from_col, to_col, num_cards)) or not isinstance(rank, str):
+            raise ValueError(f"Bad move {fields!r}")
+        if not (-1 <= from_col < 10 and -1 <= to_col < 10 and 0 < num_cards <= 13):
+            raise ValueError(f"Bad move {fields!r}")
+        moves.append(Move(from_col, to_col, num_cards, rank))
+    return moves
+
+
+class SolutionCache:
+    """
+    Solutions found by SpiderSolver, kept in sqlite keyed by position
+    fingerprint. At most max_entries are kept; put() evicts the least
+    recently used ones beyond that. Any sqlite or file system error, and any
+    row that doesn't decode, is reported and treated as a cache miss, so a
+    broken cache never stops a solve.
+    """
+    def __init__(self, path=DEFAULT_PATH, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            if str(self.path) != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path))
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "fingerprint TEXT PRIMARY KEY, moves TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+        return self._db
+
+    def get(self, fingerprint: str) -> Optional[List[Move]]:
+        try:
+            db = self._connect()
+            row = db.execute("SELECT moves FROM solutions WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with db:
+                db.execute("UPDATE solutions SET last_used = ? WHERE fingerprint = ?", (time.time(), fingerprint))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Solution cache unavailable: {e}")
+            self.misses += 1
+            return None
+        try:
+            moves = decode_moves(row[0])
+        except ValueError as e:
+            # The next put() for this position replaces the row
+            print(f"Solution cache entry unreadable: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return moves
+
+    def put(self, fingerprint: str, moves: List[Move]):
+        encoded = json.dumps([[m.from_col, m.to_col, m.num_cards, m.card_rank] for m in moves])
+        try:
+            db = self._connect()
+            with db:
+                db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", (fingerprint, encoded, time.time()))
+                db.execute(
+                    "DELETE FROM solutions WHERE fingerprint IN ("
+                    "SELECT fingerprint FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Solution cache unavailable: {e}")
+
+    def discard(self, fingerprint: str):
+        try:
+            with self._connect() as db:
+                db.execute("DELETE FROM solutions WHERE fingerprint = ?", (fingerprint,))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Solution cache unavailable: {e}")
+
+    def __len__(self):
+        try:
+            return self._connect().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,101 @@
+import time
+
+# Phases SpiderSolver times. move_gen: get_all_possible_moves. ordering:
+# _evaluate_move scoring and sorting. reduction: _reduce_moves and the deal
+# checks. apply/undo: applying and undoing moves, completed-run checks
+# included. copy: state copies in the queue-based strategies. table: table
+# keys and probes. pruning: _is_pruned. queue: heap and beam bookkeeping.
+PHASES = ("move_gen", "ordering", "reduction", "apply", "undo", "copy", "table", "pruning", "queue")
+
+
+class SolverStats:
+    """
+    Per-phase cumulative timers and call counts, plus depth and branching
+    histograms, collected by SpiderSolver while it searches.
+
+    The histograms count every node. Phases are only timed on one node in
+    sample_every (and the moves made from it) and scaled back up in
+    snapshot() and report(), which keeps the cost low enough to leave on;
+    sample_every=1 times everything, which slows a solve by a fifth or more.
+    With enabled=False the solver records nothing (see NULL_STATS).
+
+    If callback is given it is called with snapshot() about every interval
+    nodes, at the solver's progress checks.
+    """
+    def __init__(self, enabled=True, callback=None, interval=10000, sample_every=16):
+        self.enabled = enabled
+        self.callback = callback
+        self.interval = max(1, interval)
+        self.sample_every = max(1, sample_every)
+        self.reset()
+
+    def reset(self):
+        # Sampled totals; multiply by sample_every for estimates of the whole search
+        self.phase_time = dict.fromkeys(PHASES, 0.0)
+        self.phase_calls = dict.fromkeys(PHASES, 0)
+        self.depth_histogram = []  # nodes entered per depth
+        self.branching_histogram = []  # nodes expanded per number of children
+        self.next_callback = self.interval if self.callback is not None else float("inf")
+
+    def add(self, phase, start):
+        """Charge the time since start (a perf_counter reading) to phase"""
+        self.phase_time[phase] += time.perf_counter() - start
+        self.phase_calls[phase] += 1
+
+    def node(self, depth):
+        histogram = self.depth_histogram
+        if depth >= len(histogram):
+            histogram.extend([0] * (depth + 1 - len(histogram)))
+        histogram[depth] += 1
+
+    def branching(self, children):
+        histogram = self.branching_histogram
+        if children >= len(histogram):
+            histogram.extend([0] * (children + 1 - len(histogram)))
+        histogram[children] += 1
+
+    def mean_branching(self):
+        expanded = sum(self.branching_histogram)
+        if not expanded:
+            return 0.0
+        return sum(n * count for n, count in enumerate(self.branching_histogram)) / expanded
+
+    def tick(self, states_explored):
+        """Called at the solver's progress checks; fires the callback when due"""
+        if states_explored >= self.next_callback:
+            self.next_callback = states_explored + self.interval
+            self.callback(self.snapshot())
+
+    def snapshot(self) -> dict:
+        scale = self.sample_every
+        return {
+            "sample_every": scale,
+            "phases": {
+                phase: {"seconds": self.phase_time[phase] * scale, "calls": self.phase_calls[phase] * scale}
+                for phase in PHASES if self.phase_calls[phase]
+            },
+            "depth_histogram": list(self.depth_histogram),
+            "branching_histogram": list(self.branching_histogram),
+            "mean_branching": self.mean_branching(),
+        }
+
+    def report(self) -> str:
+        """Estimated phase times as printable lines, slowest first"""
+        scale = self.sample_every
+        total = sum(self.phase_time.values())
+        lines = []
+        for phase in sorted(PHASES, key=self.phase_time.get, reverse=True):
+            calls = self.phase_calls[phase] * scale
+            if not calls:
+                continue
+            seconds = self.phase_time[phase] * scale
+            share = 100 * self.phase_time[phase] / total if total else 0.0
+            lines.append(f"{phase:<10} {seconds:8.3f}s {share:5.1f}% {calls:>10} calls "
+                         f"{1e6 * seconds / calls:7.2f}us/call")
+        lines.append(f"mean branching factor {self.mean_branching():.2f}, "
+                     f"max depth {len(self.depth_histogram) - 1}")
+        return "\n".join(lines)
+
+
+# Shared disabled instance: the solver checks enabled once and records nothing
+NULL_STATS = SolverStats(enabled=False)
@@ -1,72 +1,792 @@
-from gameState import GameState
+import heapq
+import itertools
+import os
+import random
+import time
+from multiprocessing import Pool, TimeoutError as PoolTimeout
+from gameState import GameState, FACE_UP, RANK_MASK, KING, card_suit
 from gameLogic import GameLogic,Move
-from typing import List, Set
+from transpositionTable import TranspositionTable, DiskTranspositionTable
+from solverStats import SolverStats
+from typing import Dict, List, Optional
+
+# Random jitter added to move scores by non-zero ordering seeds; big enough to
+# reorder ties and near-ties, small next to the "expose a card" bonus
+ORDERING_NOISE = 8.0
+
+# Search strategies accepted by SpiderSolver(strategy=...)
+STRATEGIES = ("dfs", "best_first", "astar", "beam")
+
+# How often solve_parallel wakes up to report progress and check for cancel()
+PARALLEL_POLL_SECONDS = 0.1
+
+class SearchCancelled(Exception):
+    """Raised inside the search loops to unwind after SpiderSolver.cancel()"""
+
 
 class SpiderSolver:
-    def __init__(self, gameState: GameState):
+    def __init__(self, gameState: GameState, verify_keys: bool = False, ordering_seed: int = 0, verbose: bool = True,
+                 strategy: str = "dfs", astar_weight: float = 2.0, beam_width: int = 200,
+                 table_bytes: int = 256 * 1024 * 1024, table_replacement: str = "depth",
+                 progress_callback=None, progress_interval: int = 5000, pruning: bool = True,
+                 move_reduction: bool = True, table_path: Optional[str] = None, table_resume: bool = False,
+                 stats: Optional[SolverStats] = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
         self.initial_state = gameState.copy()
         self.solutionMoves = []
-        self.visited_states: Set[str] = set()
+        # Visited states and the depth they were searched at, capped at table_bytes.
+        # With table_path the table is a memory-mapped file instead, and
+        # table_resume lets a solve reuse what an interrupted one finished
+        if table_path is not None:
+            self.transposition_table = DiskTranspositionTable(table_path, table_bytes, table_resume)
+        else:
+            self.transposition_table = TranspositionTable(table_bytes, table_replacement)
+        self._track_finished = table_path is not None
         self.states_explored = 0
+        self.elapsed = 0.0
         self.max_depth = 150 
+        self.verbose = verbose
+
+        # Cut nodes whose moves lower bound overshoots max_depth, and positions
+        # that can provably never be cleared; counted separately in get_stats()
+        self.pruning = pruning
+        self.pruned_bound = 0
+        self.pruned_dead_end = 0
+        # Each completed run takes one card of every rank, so the cards left
+        # and the copies left of each rank follow from sequences_removed
+        cards = len(gameState.stockpile) + sum(len(col) for col in gameState.columns)
+        self._copies_per_rank = cards // 13 + gameState.sequences_removed
+
+        # Skip moves that undo the previous move without revealing anything,
+        # and play moves on disjoint columns in one canonical order only
+        self.move_reduction = move_reduction
+        self.skipped_reversals = 0
+        self.skipped_commuting = 0
+
+        # dfs: depth-first backtracking. best_first: always expand the state
+        # with the lowest _lower_bound. astar: weighted A*, f = g + weight * h.
+        # beam: breadth-first keeping the beam_width best states per depth.
+        self.strategy = strategy
+        self.astar_weight = astar_weight
+        self.beam_width = beam_width
+
+        # Search settings solve_parallel hands to each worker's own solver
+        self._worker_options = {
+            "strategy": strategy, "astar_weight": astar_weight, "beam_width": beam_width,
+            "table_bytes": table_bytes, "pruning": pruning, "move_reduction": move_reduction,
+        }
+
+        # Seed 0 is the plain _evaluate_move ordering; other seeds perturb it
+        # so parallel workers race different move orders
+        self.ordering_seed = ordering_seed
+        self._ordering_rng = random.Random(ordering_seed)
+
+        # Collision-check mode: keep the full string signature of every
+        # visited key and compare it on each hit (slow, for verification only)
+        self.verify_keys = verify_keys
+        self.key_signatures: Dict[int, bytes] = {}
+        self.key_collisions = 0
+
+        # Every progress_interval states the search calls
+        # progress_callback(states_explored, depth, states_per_sec) and checks
+        # whether cancel() was called (possibly from another thread)
+        self.progress_callback = progress_callback
+        self.progress_interval = max(1, progress_interval)
+        self._next_report = self.progress_interval
+        self._next_progress = self.progress_interval
+        self._start_time = 0.0
+        self._cancel_requested = False
+        self.cancelled = False
+
+        # Depth/branching histograms and sampled phase timers, on by default;
+        # pass solverStats.NULL_STATS to skip them. _timed is set on entering
+        # each node and is true for the sampled ones only
+        self.stats = stats if stats is not None else SolverStats()
+        self._timed = False
     
-    def solve(self):
-        print("Starting spidersolver...")
+    def cancel(self):
+        """Ask a running solve() to stop; it returns None soon after"""
+        self._cancel_requested = True
+
+    def solve(self, first_move: Optional[Move] = None):
+        """
+        Search for a solution from the initial state. If first_move is given
+        the search is restricted to lines starting with that move.
+        """
+        self._log(f"Starting spidersolver ({self.strategy})...")
         self.solutionMoves = []
-        self.visited_states.clear()
+        self.transposition_table.clear()
+        self.key_signatures.clear()
+        self.key_collisions = 0
         self.states_explored = 0
+        self.pruned_bound = 0
+        self.pruned_dead_end = 0
+        self.skipped_reversals = 0
+        self.skipped_commuting = 0
+        self.stats.reset()
+        self._next_progress = self.progress_interval
+        self._next_report = min(self._next_progress, self.stats.next_callback)
+        self._start_time = time.perf_counter()
+        self.cancelled = False
         
         state = self.initial_state.copy()
+        moves_so_far = []
+        if first_move is not None:
+            self._apply(state, first_move)
+            moves_so_far.append(first_move)
         
-        if self._backtrack(state, [] , 0):
-            print(f"Solution found! {len(self.solutionMoves)} moves")
-            return self.solutionMoves
-        print(f"No solution found. Explored {self.states_explored} states")
-        return None
-    
-    def _backtrack(self, state: GameState, moves_so_far: List[Move], depth: int):
-        self.states_explored += 1
-        if depth >= self.max_depth:
-            return False
-        
-        if self._is_solved(state):
-            self.solutionMoves = moves_so_far[:]
-            return True
-        
-        state_hash = self._hash_state(state)
-        if state_hash in self.visited_states:
-            return False
-        
-        self.visited_states.add(state_hash)
-        
-        possible_moves = GameLogic.get_all_possible_moves(state)
-        possible_moves.sort(key=lambda m: self._evaluate_move(state, m), reverse=True)
-        
-        # Try each tableau move
-        for move in possible_moves:
-            new_state = state.copy()
-            new_state.apply_move(move)
-            
-            if self._backtrack(new_state, moves_so_far + [move], depth + 1):
+        try:
+            if self.strategy == "dfs":
+                found = self._backtrack(state, moves_so_far, len(moves_so_far))
+            elif self.strategy == "beam":
+                found = self._beam_search(state, moves_so_far)
+            else:
+                found = self._priority_search(state, moves_so_far)
+        except SearchCancelled:
+            self.cancelled = True
+            found = False
+        self.elapsed = time.perf_counter() - self._start_time
+        if self._track_finished:
+            self.transposition_table.flush()
+
+        if found:
+            self._log(f"Solution found! {len(self.solutionMoves)} moves")
+        elif self.cancelled:
+            self._log("Search cancelled.")
+        else:
+            self._log("No solution found.")
+        self._log(f"Explored {self.states_explored} states in {self.elapsed:.2f}s")
+        if self.verify_keys:
+            self._log(f"Key collisions detected: {self.key_collisions}")
+        return self.solutionMoves if found else None
+
+    def close(self):
+        """Release the disk transposition table's file, if one is in use"""
+        if self._track_finished:
+            self.transposition_table.close()
+
+    def get_stats(self) -> dict:
+        """Counters from the last solve"""
+        stats = {
+            "strategy": self.strategy,
+            "states_explored": self.states_explored,
+            "elapsed": self.elapsed,
+            "nodes_per_sec": self.states_explored / self.elapsed if self.elapsed else 0.0,
+            "solution_length": len(self.solutionMoves) if self.solutionMoves else None,
+            "pruned_bound": self.pruned_bound,
+            "pruned_dead_end": self.pruned_dead_end,
+            "skipped_reversals": self.skipped_reversals,
+            "skipped_commuting": self.skipped_commuting,
+        }
+        stats.update(self.transposition_table.get_stats())
+        probes = stats["tt_hits"] + stats["tt_misses"]
+        stats["tt_hit_rate"] = stats["tt_hits"] / probes if probes else 0.0
+        if self.stats.enabled:
+            stats["profile"] = self.stats.snapshot()
+        return stats
+
+    def solve_parallel(self, workers: Optional[int] = None, orderings: int = 4):
+        """
+        Portfolio search on a process pool.
+
+        Whole-tree searches using orderings - 1 perturbed move orderings are
+        raced against the search split at the root (one task per root move,
+        in the usual order). Returns the first solution any worker finds and
+        terminates the rest. workers defaults to the number of CPU cores.
+
+        Every PARALLEL_POLL_SECONDS the parent calls progress_callback (depth
+        is reported as 0) and honours cancel(). states_explored only counts
+        tasks that finished, since terminated workers cannot report theirs.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self._log(f"Starting parallel spidersolver with {workers} workers...")
+        self.solutionMoves = []
+        self.states_explored = 0
+        self._start_time = time.perf_counter()
+        self.cancelled = False
+
+        # The orderings go first: imap_unordered dispatches tasks in order, so
+        # root subtrees queued ahead of them could hold every worker for the
+        # whole solve on a hard deal and the orderings would never start
+        options = self._worker_options
+        tasks = [(self.initial_state, None, seed, options) for seed in range(1, orderings)]
+        tasks += [(self.initial_state, move, 0, options) for move in self._root_moves(self.initial_state)]
+        if not tasks:
+            return self.solve()
+
+        found = None
+        with Pool(min(workers, len(tasks))) as pool:
+            # imap_unordered hands back results as workers finish, so the first
+            # solution wins; leaving the with-block terminates the others
+            results = pool.imap_unordered(_solve_task, tasks)
+            remaining = len(tasks)
+            while remaining and found is None:
+                try:
+                    moves, states_explored = results.next(timeout=PARALLEL_POLL_SECONDS)
+                except PoolTimeout:
+                    if self._cancel_requested:
+                        self._cancel_requested = False
+                        self.cancelled = True
+                        break
+                    if self.progress_callback is not None:
+                        elapsed = time.perf_counter() - self._start_time
+                        self.progress_callback(self.states_explored, 0, self.states_explored / elapsed)
+                    continue
+                remaining -= 1
+                self.states_explored += states_explored
+                found = moves
+        self.elapsed = time.perf_counter() - self._start_time
+
+        if found is not None:
+            self.solutionMoves = found
+            self._log(f"Solution found! {len(found)} moves")
+        elif self.cancelled:
+            self._log("Search cancelled.")
+        else:
+            self._log(f"No solution found. Explored {self.states_explored} states")
+        return found
+
+    def _priority_search(self, state: GameState, moves_so_far: List[Move]) -> bool:
+        """
+        Best-first or weighted A* search over a priority queue.
+
+        Queue entries hold a state copy and a parent-pointer path node
+        (move, parent), so the solution is rebuilt only once at the goal.
+        Ties on priority go to the move _evaluate_move likes best. The
+        transposition table keeps the shallowest depth each state was queued at;
+        entries carry their state's table key so it is computed once per child.
+        """
+        weight = self.astar_weight if self.strategy == "astar" else None
+        table = self.transposition_table
+        counter = itertools.count()
+        path = None
+        for move in moves_so_far:
+            path = (move, path)
+
+        depth = len(moves_so_far)
+        key = self._table_key(state)
+        table.store(key, depth)
+        heap = [(self._priority(depth, state, weight), 0.0, next(counter), depth, key, state, path)]
+        stats = self.stats
+        counting = stats.enabled
+        sample_every = stats.sample_every
+        timed = False
+        clock = time.perf_counter
+        while heap:
+            if timed:
+                start = clock()
+            _, _, _, depth, key, node, path = heapq.heappop(heap)
+            if timed:
+                stats.add("queue", start)
+                start = clock()
+            stored = table.depth_of(key)
+            if timed:
+                stats.add("table", start)
+            if stored is not None and stored < depth:
+                continue  # Reached again more cheaply since this entry was queued
+            self.states_explored += 1
+            if self.states_explored >= self._next_report:
+                self._report_progress(depth)
+            if counting:
+                stats.node(depth)
+                timed = self._timed = self.states_explored % sample_every == 0
+
+            if self._is_solved(node):
+                self.solutionMoves = self._unwind(path)
                 return True
-        
-        # **NEW: If no valid tableau moves OR all failed, try dealing from stockpile**
-        if len(state.stockpile) > 0 and self._can_deal_from_stockpile(state) and self._should_try_stockpile(state):
-            # Create special "DEAL" move
-            deal_move = Move(
-                from_col=-1,  # Special indicator for stockpile
-                to_col=-1,
-                num_cards=10,  # Dealing 10 cards
-                card_rank="DEAL"
-            )
-            
-            new_state = state.copy()
-            self._deal_from_stockpile(new_state)
-            
-            if self._backtrack(new_state, moves_so_far + [deal_move], depth + 1):
+            if depth >= self.max_depth:
+                continue
+            if timed:
+                start = clock()
+            pruned = self._is_pruned(node, depth)
+            if timed:
+                stats.add("pruning", start)
+            if pruned:
+                continue
+
+            child_depth = depth + 1
+            for move, score, child in self._children(node, path[0] if path else None):
+                if timed:
+                    start = clock()
+                key = self._table_key(child)
+                seen = table.visit(key, child_depth)
+                if timed:
+                    stats.add("table", start)
+                if seen:
+                    continue
+                if timed:
+                    start = clock()
+                heapq.heappush(heap, (self._priority(child_depth, child, weight), -score, next(counter),
+                                      child_depth, key, child, (move, path)))
+                if timed:
+                    stats.add("queue", start)
+        return False
+
+    def _beam_search(self, state: GameState, moves_so_far: List[Move]) -> bool:
+        """Layer-by-layer search keeping the beam_width lowest-bound states per depth"""
+        counter = itertools.count()
+        path = None
+        for move in moves_so_far:
+            path = (move, path)
+
+        table = self.transposition_table
+        table.store(self._table_key(state), len(moves_so_far))
+        stats = self.stats
+        counting = stats.enabled
+        sample_every = stats.sample_every
+        timed = False
+        clock = time.perf_counter
+        layer = [(state, path)]
+        for depth in range(len(moves_so_far), self.max_depth + 1):
+            candidates = []
+            for node, path in layer:
+                self.states_explored += 1
+                if self.states_explored >= self._next_report:
+                    self._report_progress(depth)
+                if counting:
+                    stats.node(depth)
+                    timed = self._timed = self.states_explored % sample_every == 0
+                if self._is_solved(node):
+                    self.solutionMoves = self._unwind(path)
+                    return True
+                if timed:
+                    start = clock()
+                pruned = self._is_pruned(node, depth)
+                if timed:
+                    stats.add("pruning", start)
+                if pruned:
+                    continue
+                for move, score, child in self._children(node, path[0] if path else None):
+                    if timed:
+                        start = clock()
+                    seen = table.visit(self._table_key(child), depth + 1)
+                    if timed:
+                        stats.add("table", start)
+                    if seen:
+                        continue
+                    if timed:
+                        start = clock()
+                    candidates.append((self._lower_bound(child), -score, next(counter), child, (move, path)))
+                    if timed:
+                        stats.add("queue", start)
+            if not candidates:
+                return False
+            if timed:
+                start = clock()
+            candidates.sort(key=lambda c: c[:3])
+            layer = [(child, path) for _, _, _, child, path in candidates[:self.beam_width]]
+            if timed:
+                stats.add("queue", start)
+        return False
+
+    def _children(self, state: GameState, prev_move: Optional[Move] = None):
+        """
+        Yield (move, score, child state) for every tableau move plus a legal
+        deal. prev_move, the move that led to state, drives move reduction;
+        reversals are left to the transposition table here since copied
+        states keep no undo record to tell whether the move revealed a card.
+        """
+        stats = self.stats
+        timed = self._timed
+        clock = time.perf_counter
+        if timed:
+            start = clock()
+        moves = GameLogic.get_all_possible_moves(state)
+        if timed:
+            stats.add("move_gen", start)
+            start = clock()
+        moves = self._reduce_moves(moves, prev_move, None)
+        can_deal = self._can_deal_from_stockpile(state)
+        if timed:
+            stats.add("reduction", start)
+        if stats.enabled:
+            stats.branching(len(moves) + can_deal)
+        for move in moves:
+            if timed:
+                start = clock()
+            score = self._evaluate_move(state, move)
+            if timed:
+                stats.add("ordering", start)
+                start = clock()
+            child = state.copy()
+            if timed:
+                stats.add("copy", start)
+                start = clock()
+            child.apply_move(move)
+            if timed:
+                stats.add("apply", start)
+            yield move, score, child
+        if can_deal:
+            if timed:
+                start = clock()
+            child = state.copy()
+            if timed:
+                stats.add("copy", start)
+                start = clock()
+            self._deal_from_stockpile(child)
+            if timed:
+                stats.add("apply", start)
+            yield self._deal_move(), 0.0, child
+
+    def _priority(self, depth: int, state: GameState, weight: Optional[float]) -> float:
+        if weight is None:
+            return self._lower_bound(state)
+        return depth + weight * self._lower_bound(state)
+
+    def _lower_bound(self, state: GameState) -> int:
+        """
+        Rough remaining-moves estimate: face-down cards, plus incomplete
+        same-suit runs in the face-up cards, plus deals left in the stockpile
+        """
+        estimate = (len(state.stockpile) + 9) // 10
+        for col in state.columns:
+            prev = None
+            for code in col:
+                if not code & FACE_UP:
+                    estimate += 1
+                elif prev is None or prev - code != 1:
+                    # prev - code == 1 only for a face-up card of the same
+                    # suit one rank higher, i.e. the run continues
+                    estimate += 1
+                prev = code
+        return estimate
+
+    def _is_pruned(self, state: GameState, depth: int) -> bool:
+        """True if no solution within max_depth can pass through state"""
+        if not self.pruning:
+            return False
+        # The bound is at most deals left + cards left, so most shallow
+        # nodes skip computing it
+        cards_left = 13 * (self._copies_per_rank - state.sequences_removed)
+        if depth + (len(state.stockpile) + 9) // 10 + cards_left > self.max_depth:
+            if depth + self._moves_lower_bound(state) > self.max_depth:
+                self.pruned_bound += 1
                 return True
-        
+        if self._is_dead_end(state):
+            self.pruned_dead_end += 1
+            return True
         return False
+
+    def _moves_lower_bound(self, state: GameState) -> int:
+        """
+        Admissible count of moves still needed. Every stockpile row takes a
+        deal, and every face-down card needs a flip: a move flips at most the
+        card it uncovers, plus one more only when it completes a run, and at
+        most one run per 13 cards left remains to be completed.
+        """
+        face_down = 0
+        for col in state.columns:
+            for code in col:
+                if code & FACE_UP:
+                    break
+                face_down += 1
+        runs_left = self._copies_per_rank - state.sequences_removed
+        return (len(state.stockpile) + 9) // 10 + max(0, face_down - runs_left)
+
+    def _is_dead_end(self, state: GameState) -> bool:
+        """
+        Provably unwinnable: no column can ever be emptied or turn another
+        face-down card.
+
+        A relaxed replay grows the set of face-up cards that might ever
+        leave their place, starting from none. A card might leave once it
+        could be lifted (it is on top, the card above it might leave, or the
+        cards above it run down from it) and it has somewhere to go: any
+        card one rank higher that is or might become a column top
+        (stockpile cards all will), or, for a King, the Queen of its suit to
+        complete a run on it. Moves and deals only ever cover cards, so this
+        overestimates what any real line of play can do. If no column is
+        empty and the lowest face-up card of every column (its anchor) stays
+        out of the set, no anchor ever leaves: no column empties, nothing
+        face-down is uncovered and the game can't be won.
+        """
+        columns = state.columns
+        top_masks = state.top_masks
+        run_lengths = state.run_lengths
+        stock_ranks = {code & RANK_MASK for code in state.stockpile}
+        bases = []
+        for col_idx, col in enumerate(columns):
+            if not col:
+                return False
+            base = 0
+            height = len(col)
+            while base < height and not col[base] & FACE_UP:
+                base += 1
+            if base == height:
+                return False  # No face-up card (only from hand-built layouts): don't judge it
+            # Quick exit: the anchor can be lifted with everything above it
+            # and a card one rank higher is on top somewhere or still to come
+            rank = col[base] & RANK_MASK
+            if run_lengths[col_idx] == height - base and rank != KING:
+                if top_masks[rank + 1] & ~(1 << col_idx) or rank + 1 in stock_ranks:
+                    return False
+            bases.append(base)
+
+        # Bit r of available is set while a card of rank r is, or might
+        # become, a column top; available_codes holds the same cards' codes
+        available = 0
+        for rank in stock_ranks:
+            available |= 1 << rank
+        available_codes = {code | FACE_UP for code in state.stockpile}
+        for col in columns:
+            available |= 1 << (col[-1] & RANK_MASK)
+            available_codes.add(col[-1])
+
+        leaves = [bytearray(len(col)) for col in columns]
+        changed = True
+        while changed:
+            changed = False
+            for col, base, left in zip(columns, bases, leaves):
+                top = len(col) - 1
+                liftable = True
+                for i in range(top, base - 1, -1):
+                    code = col[i]
+                    if i < top:
+                        liftable = left[i + 1] or (liftable and (code & RANK_MASK) - (col[i + 1] & RANK_MASK) == 1)
+                    if left[i] or not liftable:
+                        continue
+                    rank = code & RANK_MASK
+                    if rank == KING:
+                        # code - 1 is the face-up Queen of the same suit
+                        can_leave = code - 1 in available_codes or (i < top and col[i + 1] == code - 1)
+                    else:
+                        can_leave = available >> (rank + 1) & 1
+                    if can_leave:
+                        if i == base:
+                            return False
+                        left[i] = 1
+                        changed = True
+                        # It lands on top somewhere, and the card under it is uncovered
+                        below = col[i - 1]
+                        available |= 1 << rank | 1 << (below & RANK_MASK)
+                        available_codes.add(code)
+                        available_codes.add(below)
+        return True
+
+    @staticmethod
+    def _unwind(path) -> List[Move]:
+        """Rebuild the move list from a (move, parent) path node"""
+        moves = []
+        while path is not None:
+            move, path = path
+            moves.append(move)
+        moves.reverse()
+        return moves
+
+    def _reduce_moves(self, moves: List[Move], prev_move: Optional[Move], prev_record) -> List[Move]:
+        """
+        Drop moves made redundant by prev_move (None at the root).
+
+        Reversal: prev_move carried n cards from a to b without flipping a
+        card or completing a run (prev_record says so), so carrying n cards
+        back from b to a just restores the earlier state.
+
+        Commuting: a move touching neither of prev_move's columns could have
+        been played first with the same result, as moves only change their
+        own two columns. Of the two orders only the one with ascending
+        (from_col, to_col, num_cards) is kept. Deals touch every column and
+        never commute.
+        """
+        if not self.move_reduction or prev_move is None or prev_move.is_deal():
+            return moves
+        prev_from, prev_to = prev_move.from_col, prev_move.to_col
+        prev_order = (prev_from, prev_to, prev_move.num_cards)
+        reversible = prev_record is not None and not prev_record[3] and not prev_record[4]
+
+        kept = []
+        for move in moves:
+            from_col, to_col = move.from_col, move.to_col
+            if from_col == prev_to and to_col == prev_from:
+                if reversible and move.num_cards == prev_move.num_cards:
+                    self.skipped_reversals += 1
+                    continue
+            elif (from_col != prev_from and from_col != prev_to and to_col != prev_from and to_col != prev_to
+                  and (from_col, to_col, move.num_cards) < prev_order):
+                self.skipped_commuting += 1
+                continue
+            kept.append(move)
+        return kept
+
+    def _root_moves(self, state: GameState) -> List[Move]:
+        """First moves of the search, in the order _backtrack would try them"""
+        if self._is_solved(state):
+            return []
+        possible_moves = self._ordered_moves(state)
+        if len(state.stockpile) > 0 and self._can_deal_from_stockpile(state) and self._should_try_stockpile(state, possible_moves):
+            possible_moves.append(self._deal_move())
+        return possible_moves
+
+    def _ordered_moves(self, state: GameState) -> List[Move]:
+        timed = self._timed
+        if timed:
+            start = time.perf_counter()
+        possible_moves = GameLogic.get_all_possible_moves(state)
+        if timed:
+            self.stats.add("move_gen", start)
+            start = time.perf_counter()
+        if self.ordering_seed:
+            rng = self._ordering_rng
+            possible_moves.sort(key=lambda m: self._evaluate_move(state, m) + rng.random() * ORDERING_NOISE, reverse=True)
+        else:
+            possible_moves.sort(key=lambda m: self._evaluate_move(state, m), reverse=True)
+        if timed:
+            self.stats.add("ordering", start)
+        return possible_moves
+
+    def _apply(self, state: GameState, move: Move):
+        """Apply a tableau or DEAL move in place and return its undo record"""
+        if move.is_deal():
+            return self._deal_from_stockpile(state)
+        return state.apply_move(move)
+
+    def _report_progress(self, depth: int):
+        """Cancel check plus whichever of the progress and stats callbacks is due"""
+        if self._cancel_requested:
+            self._cancel_requested = False
+            raise SearchCancelled()
+        if self.states_explored >= self._next_progress:
+            self._next_progress = self.states_explored + self.progress_interval
+            if self.progress_callback is not None:
+                elapsed = time.perf_counter() - self._start_time
+                rate = self.states_explored / elapsed if elapsed else 0.0
+                self.progress_callback(self.states_explored, depth, rate)
+        self.stats.tick(self.states_explored)
+        self._next_report = min(self._next_progress, self.stats.next_callback)
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+    
+    def _backtrack(self, state: GameState, moves_so_far: List[Move], depth: int):
+        """
+        Depth-first search driven by an explicit stack instead of recursion.
+
+        The search walks one mutable state: each child is reached with
+        apply_move()/deal_row() and left again with state.undo(), so no state
+        is copied per node. Each stack frame is
+        [candidate moves, next move index, deal tried, undo record of the move
+        that led to the frame, table key of the frame's state]. The current line of play lives in a single path
+        buffer that is pushed and popped alongside the stack.
+        """
+        path = list(moves_so_far)
+        stack = []
+        stats = self.stats
+        counting = stats.enabled
+        sample_every = stats.sample_every
+        timed = False
+        clock = time.perf_counter
+
+        record = None
+        entering = True
+        while True:
+            # Enter the node the last move led to
+            if entering:
+                entering = False
+                self.states_explored += 1
+                if self.states_explored >= self._next_report:
+                    self._report_progress(depth)
+                if counting:
+                    stats.node(depth)
+                    timed = self._timed = self.states_explored % sample_every == 0
+                if depth < self.max_depth:
+                    if self._is_solved(state):
+                        self.solutionMoves = path[:]
+                        return True
+
+                    if timed:
+                        start = clock()
+                    key = self._table_key(state)
+                    expand = not self._is_visited(state, depth, key)
+                    if timed:
+                        stats.add("table", start)
+                    # A pruned state stays in the table: it is just as hopeless
+                    # when reached again at the same depth or deeper
+                    if expand:
+                        if timed:
+                            start = clock()
+                        expand = not self._is_pruned(state, depth)
+                        if timed:
+                            stats.add("pruning", start)
+                    if expand:
+                        all_moves = self._ordered_moves(state)
+                        if timed:
+                            start = clock()
+                        possible_moves = self._reduce_moves(all_moves, path[-1] if path else None, record)
+                        # Whether to deal depends on the unreduced moves, so
+                        # reduction never makes the search deal earlier
+                        deal_ruled_out = not self._should_try_stockpile(state, all_moves)
+                        if timed:
+                            stats.add("reduction", start)
+                        if counting:
+                            stats.branching(len(possible_moves) + (not deal_ruled_out and bool(state.stockpile)))
+                        stack.append([possible_moves, 0, deal_ruled_out, record, key])
+                        depth += 1
+                        continue
+                # Dead end: step back out (the root has no move to undo)
+                if stack:
+                    if timed:
+                        start = clock()
+                    state.undo(record)
+                    if timed:
+                        stats.add("undo", start)
+                    path.pop()
+
+            if not stack:
+                return False
+
+            frame = stack[-1]
+            possible_moves, index, deal_tried, _, _ = frame
+
+            # Try each tableau move
+            if index < len(possible_moves):
+                move = possible_moves[index]
+                frame[1] = index + 1
+
+                if timed:
+                    start = clock()
+                record = state.apply_move(move)
+                if timed:
+                    stats.add("apply", start)
+                path.append(move)
+                entering = True
+                continue
+
+            # If no valid tableau moves OR all failed, try dealing from stockpile
+            if not deal_tried:
+                frame[2] = True
+                if len(state.stockpile) > 0 and self._can_deal_from_stockpile(state):
+                    if timed:
+                        start = clock()
+                    record = self._deal_from_stockpile(state)
+                    if timed:
+                        stats.add("apply", start)
+                    path.append(self._deal_move())
+                    entering = True
+                    continue
+
+            # Every child failed: backtrack to the previous frame
+            if self._track_finished:
+                self.transposition_table.finish(frame[4])
+            stack.pop()
+            depth -= 1
+            if stack:
+                if timed:
+                    start = clock()
+                state.undo(frame[3])
+                if timed:
+                    stats.add("undo", start)
+                path.pop()
+
+    def _deal_move(self) -> Move:
+        """Special "DEAL" move used to record a stockpile deal in the solution"""
+        return Move(
+            from_col=-1,  # Special indicator for stockpile
+            to_col=-1,
+            num_cards=10,  # Dealing 10 cards
+            card_rank="DEAL"
+        )
     
     def _can_deal_from_stockpile(self, state: GameState) -> bool:
         """
@@ -86,39 +806,48 @@ class SpiderSolver:
     def _deal_from_stockpile(self, state: GameState):
         """
         Deal one row from stockpile (up to 10 cards, one per column)
-        Modifies state in-place
-        """
-        cards_to_deal = min(10, len(state.stockpile))
-        
-        for i in range(cards_to_deal):
-            card = state.stockpile.pop()
-            card.face_up = True
-            state.columns[i].append(card)
-        
-        # After dealing, check each column for complete sequences
-        for col_idx in range(cards_to_deal):
-            removed = GameLogic.check_and_remove_complete_sequence(
-                state.columns[col_idx]
-            )
-            if removed:
-                state.sequences_removed += 1
-                # Flip newly exposed card
-                if state.columns[col_idx]:
-                    if not state.columns[col_idx][-1].face_up:
-                        state.columns[col_idx][-1].face_up = True
+        Modifies state in-place and returns the undo record
+        """
+        return state.deal_row()
     
-    def _hash_state(self, state: GameState) -> str:
-        hash_parts = []
-        for col in state.columns:
-            col_str = "|".join(
-                f"{card.rank}{card.suit}{'U' if card.face_up else 'D'}"
-                for card in col
-            )
-            hash_parts.append(col_str)
-        
-        hash_parts.append(f"STOCK:{len(state.stockpile)}")
+    def _is_visited(self, state: GameState, depth: int, key: int) -> bool:
+        """
+        Probe the transposition table with key, the state's _table_key(). On a
+        miss the state is recorded at this depth. Verify mode also checks for
+        collisions.
+        """
+        if self.verify_keys:
+            if state.key != state.compute_key():
+                raise RuntimeError("Incremental state key diverged from full recompute")
+            hashes = state.column_hashes
+            if hashes is not None and hashes != [state.column_hash(i) for i in range(len(state.columns))]:
+                raise RuntimeError("Incremental column hashes diverged from full recompute")
+            signature = self._hash_state(state)
+            known = self.key_signatures.setdefault(key, signature)
+            if known != signature:
+                # Different position with the same key: count it and explore anyway
+                self.key_collisions += 1
+                return False
+
+        return self.transposition_table.visit(key, depth)
+
+    @staticmethod
+    def _table_key(state: GameState) -> int:
+        """
+        Transposition key: the incremental Zobrist key while the stockpile
+        still tells columns apart, the column-order-free canonical key after.
+        The canonical key costs O(cards), so callers compute it once per node.
+        """
+        return state.key if state.stockpile else state.canonical_key()
+
+    def _hash_state(self, state: GameState) -> bytes:
+        """Full signature of a state, used only to verify Zobrist keys"""
+        hash_parts = [bytes(col) for col in state.columns]
+        if not state.stockpile:
+            hash_parts.sort()  # Matches the canonical key's column-order freedom
+        hash_parts.append(f"STOCK:{len(state.stockpile)}".encode())
         
-        return "::".join(hash_parts)
+        return b"::".join(hash_parts)
     
     def _is_solved(self, state: GameState) -> bool:
         """Game is solved when all columns are empty"""
@@ -136,7 +865,7 @@ class SpiderSolver:
         # 1. Expose face-down cards (highest priority!)
         if len(from_col) > move.num_cards:
             card_below = from_col[-(move.num_cards + 1)]
-            if not card_below.face_up:
+            if not card_below & FACE_UP:
                 score += 50
         
         # 2. Prefer moving longer sequences
@@ -147,9 +876,8 @@ class SpiderSolver:
             score += 20
         
         # 4. Prefer suited builds
-        cards_to_move = from_col[-move.num_cards:]
-        if to_col and cards_to_move:
-            if cards_to_move[0].suit == to_col[-1].suit:
+        if to_col:
+            if card_suit(from_col[-move.num_cards]) == card_suit(to_col[-1]):
                 score += 10
         
         # 5. Penalize moves to empty columns unless King
@@ -169,16 +897,36 @@ class SpiderSolver:
                 score -= 10
         
         return score
-    def _should_try_stockpile(self, state: GameState) -> bool:
+    def _should_try_stockpile(self, state: GameState, possible_moves: Optional[List[Move]] = None) -> bool:
         """
         Only deal from stockpile if we're REALLY stuck
         Don't deal prematurely - it makes the game harder!
+        Pass the moves already generated for state to skip regenerating them.
         """
-        possible_moves = GameLogic.get_all_possible_moves(state)
+        if possible_moves is None:
+            possible_moves = GameLogic.get_all_possible_moves(state)
         
         # If we have ANY moves available, don't deal yet
         if len(possible_moves) > 0:
             return False  # Let backtracking try all moves first
         
         # Only deal when truly stuck (no moves possible)
-        return True
\ No newline at end of file
+        return True
+
+
+def _solve_task(task):
+    """Pool worker: run one portfolio task, return (moves or None, states explored)"""
+    state, first_move, ordering_seed, solver_options = task
+    solver = SpiderSolver(state, ordering_seed=ordering_seed, verbose=False, **solver_options)
+    moves = solver.solve(first_move)
+    return moves, solver.states_explored
+
+
+def compare_strategies(state: GameState, strategies=STRATEGIES, **solver_options) -> List[dict]:
+    """Solve the same position with each strategy and return their get_stats()"""
+    results = []
+    for strategy in strategies:
+        solver = SpiderSolver(state, strategy=strategy, verbose=False, **solver_options)
+        solver.solve()
+        results.append(solver.get_stats())
+    return results
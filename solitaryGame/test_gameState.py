@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from gameLogic import GameLogic, Move
+from gameState import GameState, parse_card
+
+# Lone face-up cards for filling out hand-built layouts
+SPARE_TOPS = ["5S", "5D", "6S", "6D", "7S", "7D", "8S", "8D"]
+
+
+def fresh_hashes(state):
+    return [state.column_hash(col_idx) for col_idx in range(len(state.columns))]
+
+
+def test_column_hashes_follow_moves_deals_and_undo():
+    for seed in range(5):
+        rng = random.Random(seed)
+        state = GameState.from_seed(seed)
+        records = []
+        for _ in range(400):
+            moves = GameLogic.get_all_possible_moves(state)
+            if state.stockpile and all(state.columns) and (not moves or rng.random() < 0.1):
+                records.append(state.deal_row())
+            elif moves:
+                records.append(state.apply_move(rng.choice(moves)))
+            else:
+                break
+            if state.stockpile:
+                assert state.column_hashes is None
+            else:
+                assert state.column_hashes == fresh_hashes(state)
+            assert state.copy().canonical_key() == state.canonical_key()
+        while records:
+            state.undo(records.pop())
+            assert state.column_hashes in (None, fresh_hashes(state))
+        assert state.key == GameState.from_seed(seed).key
+
+
+def test_canonical_key_ignores_column_order():
+    state = GameState.from_seed(3)
+    state.stockpile.clear()
+    swapped = GameState(columns=state.columns[::-1], stockpile=bytearray())
+    assert swapped.canonical_key() == GameState(columns=state.columns, stockpile=bytearray()).canonical_key()
+
+
+def test_column_hashes_follow_completed_runs():
+    hearts = ["K", "Q", "J", "10", "9", "8", "7", "6", "5", "4", "3", "2"]
+    columns = [["[2C]"] + [rank + "H" for rank in hearts], ["AH"]] + [[card] for card in SPARE_TOPS]
+    state = GameState.from_layout(columns)
+    record = state.apply_move(Move(1, 0, 1, "A"))
+    assert state.sequences_removed == 1
+    assert state.columns[0] == bytearray([parse_card("2C")])
+    assert state.column_hashes == fresh_hashes(state)
+    state.undo(record)
+    assert state.column_hashes == fresh_hashes(state)
+
+
+
+def test_layout_that_could_overflow_a_column_is_rejected():
+    # Moving AH onto the 2H would make column 9 the 105th card high, past the Zobrist table
+    columns = [["AH"]] + [[]] * 8 + [["[KS]"] * 103 + ["2H"]]
+    with pytest.raises(ValueError, match="105 cards"):
+        GameState.from_layout(columns)
+
+
+def test_layout_with_three_copies_of_a_card_is_rejected():
+    columns = [["AH"], ["AH"], ["[AH]", "5C"]] + [[card] for card in SPARE_TOPS[:7]]
+    with pytest.raises(ValueError, match="3 copies of AH"):
+        GameState.from_layout(columns)
+    columns[2] = ["5C"]
+    assert GameState.from_layout(columns).columns[1] == bytearray([parse_card("AH")])
@@ -0,0 +1,27 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import assets_manager
+from deck import Deck
+from game_board import GameBoard
+
+
+def test_deal_animation_draws_from_atlas(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets_manager, "ATLAS_DIR", tmp_path)
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    board = GameBoard(1280, 720, Deck(), seed=1)
+    board.draw(screen)
+
+    board.deal_from_stockpile()
+    assert board.tweens
+    while board.tweens:
+        board.update_animations(1 / 60)
+        board.draw(screen)
+
+    stats = board.card_images.stats()
+    assert stats["atlas"]
+    assert stats["faces_loaded"] == 0
@@ -0,0 +1,34 @@
+from gameLogic import Move
+from solutionCache import SolutionCache
+
+MOVES = [Move(0, 1, 2, "9"), Move(-1, -1, 10, "DEAL")]
+
+
+def test_round_trip():
+    cache = SolutionCache(":memory:")
+    assert cache.get("abc") is None
+    cache.put("abc", MOVES)
+    assert cache.get("abc") == MOVES
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unusable_directory_is_a_miss(tmp_path):
+    blocker = tmp_path / "cache"
+    blocker.write_text("not a directory")
+    cache = SolutionCache(blocker / "solutions.sqlite")
+    cache.put("abc", MOVES)
+    cache.discard("abc")
+    assert cache.get("abc") is None
+    assert len(cache) == 0
+    assert cache.misses == 1
+
+
+def test_corrupt_rows_are_misses():
+    cache = SolutionCache(":memory:")
+    rows = ["not json", "[[0, 1]]", '[[0, 1, 2, 9]]', '[["0", 1, 2, "9"]]', '[[0, 42, 2, "9"]]', "{}", "7"]
+    for i, text in enumerate(rows):
+        cache._connect().execute("INSERT INTO solutions VALUES (?, ?, 0)", (str(i), text))
+        assert cache.get(str(i)) is None
+    assert cache.misses == len(rows)
+    cache.put("0", MOVES)
+    assert cache.get("0") == MOVES
@@ -0,0 +1,41 @@
+from gameLogic import Move
+from gameState import GameState
+from spiderSolver import SpiderSolver
+
+
+def deal_move():
+    return Move(from_col=-1, to_col=-1, num_cards=10, card_rank="DEAL")
+
+
+def stuck_after_last_deal():
+    """Deal 27 after both deals and two moves: every column's lowest face-up card is stuck"""
+    state = GameState.from_seed(27)
+    for move in (deal_move(), Move(3, 0, 2, "J"), Move(0, 8, 3, "Q"), deal_move()):
+        if move.is_deal():
+            state.deal_row()
+        else:
+            state.apply_move(move)
+    return state
+
+
+def test_dead_end_prunes_reachable_position():
+    state = stuck_after_last_deal()
+    solver = SpiderSolver(state, verbose=False)
+    assert solver._is_dead_end(state)
+    assert solver.solve() is None
+    assert solver.pruned_dead_end == 1
+    assert solver.states_explored == 1
+
+
+def test_dead_end_agrees_with_exhaustive_search():
+    solver = SpiderSolver(stuck_after_last_deal(), verbose=False, pruning=False)
+    solver.max_depth = 300
+    assert solver.solve() is None
+    assert not solver.cancelled
+
+
+def test_opening_deals_are_not_dead_ends():
+    for seed in range(20):
+        state = GameState.from_seed(seed)
+        assert not SpiderSolver(state, verbose=False)._is_dead_end(state)
+
@@ -0,0 +1,305 @@
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+# Rough in-memory cost of one entry (key int, depth, dict slot and the
+# replacement bookkeeping), used to turn a byte budget into an entry count
+ENTRY_BYTES = 160
+
+REPLACEMENT_POLICIES = ("depth", "lru")
+
+
+class TranspositionTable:
+    """
+    Memory-bounded map from state key to the shallowest depth it was searched at.
+
+    seen(key, depth) is a hit when the state was already searched at that depth
+    or shallower; a state reached again at a shallower depth is a miss, so the
+    caller re-expands it with the larger remaining depth budget.
+
+    When full, "depth" replacement evicts the deepest entry (its subtree is the
+    smallest, so it is the cheapest to redo) and "lru" evicts the least
+    recently used one.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, replacement: str = "depth"):
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement {replacement!r}, expected one of {REPLACEMENT_POLICIES}")
+        self.capacity = max(1, max_bytes // ENTRY_BYTES)
+        self.replacement = replacement
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if replacement == "lru":
+            self._depths: Dict[int, int] = OrderedDict()
+        else:
+            self._depths = {}
+        # depth-preferred only: keys bucketed by stored depth
+        self._by_depth: List[Set[int]] = []
+
+    def __len__(self):
+        return len(self._depths)
+
+    def clear(self):
+        self._depths.clear()
+        self._by_depth = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def seen(self, key: int, depth: int) -> bool:
+        """True if key was already searched at depth or shallower"""
+        stored = self._depths.get(key)
+        if stored is not None and stored <= depth:
+            self.hits += 1
+            if self.replacement == "lru":
+                self._depths.move_to_end(key)
+            return True
+        self.misses += 1
+        return False
+
+    def visit(self, key: int, depth: int) -> bool:
+        """seen() and, on a miss, store() in one probe"""
+        stored = self._depths.get(key)
+        if stored is not None and stored <= depth:
+            self.hits += 1
+            if self.replacement == "lru":
+                self._depths.move_to_end(key)
+            return True
+        self.misses += 1
+        self.store(key, depth)
+        return False
+
+    def depth_of(self, key: int) -> Optional[int]:
+        """Stored depth for key, or None; does not count as a probe"""
+        return self._depths.get(key)
+
+    def store(self, key: int, depth: int):
+        """Record that key is being searched at depth"""
+        depths = self._depths
+        stored = depths.get(key)
+        if stored is None:
+            if len(depths) >= self.capacity:
+                self._evict()
+        elif self.replacement == "depth":
+            self._by_depth[stored].discard(key)
+
+        depths[key] = depth
+        if self.replacement == "lru":
+            depths.move_to_end(key)
+        else:
+            while len(self._by_depth) <= depth:
+                self._by_depth.append(set())
+            self._by_depth[depth].add(key)
+
+    def _evict(self):
+        if self.replacement == "lru":
+            self._depths.popitem(last=False)
+        else:
+            buckets = self._by_depth
+            while not buckets[-1]:
+                buckets.pop()
+            del self._depths[buckets[-1].pop()]
+        self.evictions += 1
+
+    def finish(self, key: int):
+        """Only the disk table tracks fully searched states"""
+
+    def get_stats(self) -> dict:
+        return {
+            "tt_entries": len(self._depths),
+            "tt_capacity": self.capacity,
+            "tt_hits": self.hits,
+            "tt_misses": self.misses,
+            "tt_evictions": self.evictions,
+        }
+
+
+# Disk table slot, high to low bits: 48-bit fingerprint | 7-bit generation |
+# 8-bit depth | closed bit.
+# An all-zero slot is empty; fingerprints are never 0.
+SLOT_BYTES = 8
+HEADER = struct.Struct("<4sIQIIQ")  # magic, version, capacity, generation, base generation, entries
+HEADER_BYTES = 64
+MAGIC = b"SPTT"
+VERSION = 2  # 2: Zobrist values drawn with randbytes, so version 1 keys no longer match
+MAX_GENERATION = 127
+MAX_STORED_DEPTH = 255
+PROBE_LIMIT = 16
+FINGERPRINT_SHIFT = 16
+CLOSED = 1
+GENERATION_SHIFT = 9
+
+
+class DiskTranspositionTable:
+    """
+    Transposition table in a fixed-size memory-mapped file, for searches
+    whose visited set doesn't fit in RAM; the OS page cache keeps the hot
+    part in memory.
+
+    Open addressing with linear probing over PROBE_LIMIT slots: the key's
+    low bits pick the home slot and its high 48 bits are stored as the
+    fingerprint. A full probe window evicts a stale entry, else the deepest.
+
+    Each clear() (SpiderSolver.solve() calls it) starts a new generation,
+    so old entries are dropped without rewriting the file. With resume=True
+    the generations back to the last run made without resume stay usable,
+    but only for states the search finish()ed, i.e. fully searched without
+    a solution: the line an interrupted solve was on gets searched again.
+    """
+
+    def __init__(self, path, max_bytes: int = 1024 * 1024 * 1024, resume: bool = False):
+        self.path = path
+        self.resume = resume
+        slots = max(PROBE_LIMIT, (max_bytes - HEADER_BYTES) // SLOT_BYTES)
+        self.capacity = 1 << (slots.bit_length() - 1)  # power of two, so key & mask picks the home slot
+        self._mask = self.capacity - 1
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        size = HEADER_BYTES + self.capacity * SLOT_BYTES
+        header = None
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            with open(path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+            if header[0] != MAGIC or header[1] != VERSION or header[2] != self.capacity:
+                header = None
+        self._file = open(path, "r+b" if header else "w+b")
+        if header is None:
+            self._file.truncate(size)  # sparse: untouched pages cost no disk
+            self.generation, self.base_generation, self.entries = 0, 0, 0
+        else:
+            _, _, _, self.generation, self.base_generation, self.entries = header
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._slots = memoryview(self._map)[HEADER_BYTES:].cast("Q")
+        if header is None:
+            self._write_header()
+
+    def __len__(self):
+        return self.entries
+
+    def _write_header(self):
+        self._map[:HEADER.size] = HEADER.pack(MAGIC, VERSION, self.capacity, self.generation,
+                                              self.base_generation, self.entries)
+
+    def clear(self):
+        """Start a new generation; with resume, finished states of earlier ones stay hits"""
+        if self.generation >= MAX_GENERATION:
+            # Generation numbers ran out: really wipe the file
+            self._zero_slots()
+            self.generation, self.base_generation, self.entries = 0, 0, 0
+        self.generation += 1
+        if not self.resume or self.base_generation == 0:
+            self.base_generation = self.generation
+            self.entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._write_header()
+
+    def _zero_slots(self):
+        chunk = bytes(1 << 20)
+        for offset in range(HEADER_BYTES, len(self._map), len(chunk)):
+            end = min(offset + len(chunk), len(self._map))
+            self._map[offset:end] = chunk[:end - offset]
+
+    def _live(self, slot: int) -> bool:
+        """Current-generation entry, or a finished one from an earlier run being resumed"""
+        generation = (slot >> GENERATION_SHIFT) & MAX_GENERATION
+        if generation == self.generation:
+            return True
+        return slot & CLOSED and self.base_generation <= generation < self.generation
+
+    def _find(self, key: int):
+        """(index of key's live slot or None, index to store key at)"""
+        fingerprint = (key >> FINGERPRINT_SHIFT) or 1
+        slots = self._slots
+        home = key & self._mask
+        free = None
+        victim, victim_depth = home, -1
+        for i in range(PROBE_LIMIT):
+            index = (home + i) & self._mask
+            slot = slots[index]
+            if slot == 0:
+                return None, index if free is None else free
+            if not self._live(slot):
+                if free is None:
+                    free = index
+                continue
+            if slot >> FINGERPRINT_SHIFT == fingerprint:
+                return index, index
+            depth = (slot >> 1) & MAX_STORED_DEPTH
+            if depth > victim_depth:
+                victim, victim_depth = index, depth
+        return None, victim if free is None else free
+
+    def _depth(self, index) -> Optional[int]:
+        return None if index is None else (self._slots[index] >> 1) & MAX_STORED_DEPTH
+
+    def seen(self, key: int, depth: int) -> bool:
+        stored = self._depth(self._find(key)[0])
+        if stored is not None and stored <= depth:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def visit(self, key: int, depth: int) -> bool:
+        index, target = self._find(key)
+        stored = self._depth(index)
+        if stored is not None and stored <= depth:
+            self.hits += 1
+            return True
+        self.misses += 1
+        self._store_at(target, key, depth, index is not None)
+        return False
+
+    def depth_of(self, key: int) -> Optional[int]:
+        return self._depth(self._find(key)[0])
+
+    def store(self, key: int, depth: int):
+        index, target = self._find(key)
+        self._store_at(target, key, depth, index is not None)
+
+    def _store_at(self, index: int, key: int, depth: int, replacing: bool):
+        old = self._slots[index]
+        if not replacing:
+            if old == 0 or not self._live(old):
+                self.entries += 1
+            else:
+                self.evictions += 1
+        fingerprint = (key >> FINGERPRINT_SHIFT) or 1
+        self._slots[index] = (fingerprint << FINGERPRINT_SHIFT) | (self.generation << GENERATION_SHIFT) | (min(depth, MAX_STORED_DEPTH) << 1)
+
+    def finish(self, key: int):
+        """Mark key as fully searched without finding a solution"""
+        index = self._find(key)[0]
+        if index is not None:
+            self._slots[index] |= CLOSED
+
+    def flush(self):
+        self._write_header()
+        self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self.flush()
+            self._slots.release()
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def get_stats(self) -> dict:
+        return {
+            "tt_entries": self.entries,
+            "tt_capacity": self.capacity,
+            "tt_hits": self.hits,
+            "tt_misses": self.misses,
+            "tt_evictions": self.evictions,
+        }
@@ -0,0 +1,134 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback, same behaviour
+    np = None
+
+
+class TweenEngine:
+    """
+    Straight-line tweens moving at a constant speed (pixels per second).
+
+    Positions and targets live in parallel arrays (NumPy when available) and
+    step(dt) advances every tween in one batched pass. A finished tween is
+    swap-removed with the last slot, so completion is O(1) per tween; step()
+    still returns finished payloads in the order they were added, which is
+    the order cards have to land in their column.
+    """
+    def __init__(self, speed=900.0, capacity=32):
+        self.speed = speed
+        self._payloads = []
+        self._order = []  # insertion sequence number per slot
+        self._next_seq = 0
+        if np is not None:
+            self._pos = np.zeros((capacity, 2))
+            self._target = np.zeros((capacity, 2))
+        else:
+            self._x, self._y = array("d"), array("d")
+            self._tx, self._ty = array("d"), array("d")
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def __bool__(self):
+        return bool(self._payloads)
+
+    def payloads(self):
+        return list(self._payloads)
+
+    def clear(self):
+        self._payloads.clear()
+        self._order.clear()
+        if np is None:
+            for values in (self._x, self._y, self._tx, self._ty):
+                del values[:]
+
+    def add(self, payload, start, target):
+        """Start moving payload from start to target (both (x, y))"""
+        slot = len(self._payloads)
+        if np is not None:
+            if slot == len(self._pos):
+                self._pos = np.resize(self._pos, (slot * 2, 2))
+                self._target = np.resize(self._target, (slot * 2, 2))
+            self._pos[slot] = start
+            self._target[slot] = target
+        else:
+            self._x.append(start[0])
+            self._y.append(start[1])
+            self._tx.append(target[0])
+            self._ty.append(target[1])
+        self._payloads.append(payload)
+        self._order.append(self._next_seq)
+        self._next_seq += 1
+
+    def position(self, slot):
+        if np is not None:
+            return self._pos[slot, 0], self._pos[slot, 1]
+        return self._x[slot], self._y[slot]
+
+    def items(self):
+        """(payload, x, y) for every tween still moving"""
+        return [(payload, *self.position(slot)) for slot, payload in enumerate(self._payloads)]
+
+    def step(self, dt):
+        """Advance every tween by speed * dt; return the payloads that arrived"""
+        count = len(self._payloads)
+        if not count:
+            return []
+        reach = self.speed * dt
+        if np is not None:
+            done = self._step_numpy(count, reach)
+        else:
+            done = self._step_python(count, reach)
+        if not done:
+            return []
+
+        finished = sorted((self._order[slot], self._payloads[slot]) for slot in done)
+        # Highest slot first, so a swap never moves a slot that is still to be removed
+        for slot in sorted(done, reverse=True):
+            self._remove(slot)
+        return [payload for _, payload in finished]
+
+    def _step_numpy(self, count, reach):
+        pos = self._pos[:count]
+        delta = self._target[:count] - pos
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        arrived = distance <= reach
+        moving = ~arrived
+        pos[moving] += delta[moving] * (reach / distance[moving])[:, None]
+        pos[arrived] = self._target[:count][arrived]
+        return np.flatnonzero(arrived).tolist()
+
+    def _step_python(self, count, reach):
+        xs, ys, txs, tys = self._x, self._y, self._tx, self._ty
+        done = []
+        for slot in range(count):
+            dx = txs[slot] - xs[slot]
+            dy = tys[slot] - ys[slot]
+            distance = (dx * dx + dy * dy) ** 0.5
+            if distance <= reach:
+                xs[slot], ys[slot] = txs[slot], tys[slot]
+                done.append(slot)
+            else:
+                ratio = reach / distance
+                xs[slot] += dx * ratio
+                ys[slot] += dy * ratio
+        return done
+
+    def _remove(self, slot):
+        last = len(self._payloads) - 1
+        if slot != last:
+            self._payloads[slot] = self._payloads[last]
+            self._order[slot] = self._order[last]
+            if np is not None:
+                self._pos[slot] = self._pos[last]
+                self._target[slot] = self._target[last]
+            else:
+                for values in (self._x, self._y, self._tx, self._ty):
+                    values[slot] = values[last]
+        self._payloads.pop()
+        self._order.pop()
+        if np is None:
+            for values in (self._x, self._y, self._tx, self._ty):
+                values.pop()